@@ -1,6 +1,10 @@
 """
 Configuration for 2026 AFL Supercoach
 """
+import os
+from types import MappingProxyType
+
+import numpy as np
 
 # Team constraints
 SALARY_CAP = 10000000  # $10 million salary cap
@@ -11,7 +15,7 @@ TEAM_SIZE = 30  # Total players in team
 # - 22 on-field players (6 DEF, 8 MID, 2 RUC, 6 FWD)
 # - 8 bench players (any position mix, typically emergency coverage for each position)
 # Max values allow flexibility for bench composition
-POSITION_REQUIREMENTS = {
+POSITION_REQUIREMENTS_FLEX = {
     'DEF': {'min': 6, 'max': 9, 'on_field': 6},   # 6 onfield, up to 3 bench
     'MID': {'min': 8, 'max': 11, 'on_field': 8},  # 8 onfield, up to 3 bench
     'RUC': {'min': 2, 'max': 4, 'on_field': 2},   # 2 onfield, up to 2 bench
@@ -19,11 +23,56 @@ POSITION_REQUIREMENTS = {
 }
 # Total: 22 onfield + flexible 8 bench (max total = 33 but constrained to 30 by TEAM_SIZE)
 
+# Strict layout used by the budget-allocation optimizers: each position is
+# filled to exactly its on-field count and the bench is its own 8-player slot
+POSITION_REQUIREMENTS_STRICT = {
+    'DEF': {'min': 6, 'max': 6, 'on_field': 6},
+    'MID': {'min': 8, 'max': 8, 'on_field': 8},
+    'RUC': {'min': 2, 'max': 2, 'on_field': 2},
+    'FWD': {'min': 6, 'max': 6, 'on_field': 6},
+    'BENCH': {'min': 8, 'max': 8, 'on_field': 0},
+}
+
+
+def _freeze_requirements(requirements):
+    """Return a read-only view of a position requirements table"""
+    return MappingProxyType({pos: MappingProxyType(dict(req)) for pos, req in requirements.items()})
+
+
+_POSITION_REQUIREMENTS_BY_MODE = {
+    'flex': _freeze_requirements(POSITION_REQUIREMENTS_FLEX),
+    'strict': _freeze_requirements(POSITION_REQUIREMENTS_STRICT),
+}
+
+
+def get_position_requirements(mode='flex'):
+    """Get the (read-only) position requirements for 'flex' or 'strict' mode"""
+    if mode not in _POSITION_REQUIREMENTS_BY_MODE:
+        raise ValueError(f"Unknown position requirements mode: {mode}")
+    return _POSITION_REQUIREMENTS_BY_MODE[mode]
+
+
+# Default requirements used by the main optimizer
+POSITION_REQUIREMENTS = get_position_requirements('flex')
+
+# Canonical position order and the default requirements as a read-only
+# (4, 3) int8 matrix of (min, max, on_field) rows in that order, so solvers can
+# build constraints with `mins, maxs, on_field = POS_REQ_ARRAY.T`
+POS_ORDER = ('DEF', 'MID', 'RUC', 'FWD')
+POS_REQ_ARRAY = np.array(
+    [[POSITION_REQUIREMENTS[pos][key] for key in ('min', 'max', 'on_field')] for pos in POS_ORDER],
+    dtype=np.int8,
+)
+POS_REQ_ARRAY.setflags(write=False)
+
 # Total on-field: 22 players (6+8+2+6)
 # Total bench: 8 players (flexible positioning)
 STARTING_LINEUP_SIZE = 22
 BENCH_SIZE = 8
 
+# Number of players generated by AFLDataCollector.load_sample_data
+NUM_PLAYERS = 450
+
 # Scoring system weights
 SCORING_WEIGHTS = {
     'kicks': 3,
@@ -37,6 +86,16 @@ SCORING_WEIGHTS = {
     'behinds': 1
 }
 
+# Canonical stat order and the matching weight vector, built once at import so
+# scores can be computed as `stats @ SCORING_WEIGHTS_VEC`
+STAT_ORDER = tuple(SCORING_WEIGHTS)
+SCORING_WEIGHTS_VEC = np.array([SCORING_WEIGHTS[stat] for stat in STAT_ORDER], dtype=np.float32)
+
+# Directory for on-disk caches (fetched FootyWire pages, parsed player details
+# and generated sample data), next to this file so every working directory
+# shares one cache
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
 # Data sources (placeholder - would need actual AFL stats API)
 DATA_SOURCES = {
     'historical_stats': 'https://www.afl.com.au/stats',
@@ -0,0 +1,4 @@
+"""
+pytest configuration: having this file at the repository root puts the root
+on sys.path, so the tests import the top-level modules directly
+"""
@@ -5,259 +5,476 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
 import time
 import re
+import os
+import hashlib
+import json
+from io import StringIO
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple
+import config
+
+
+# Supercoach positions (also the category order of the 'position' column)
+POSITIONS = list(config.POS_ORDER)
+
+# Browser-like headers for FootyWire requests
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Seconds a cached FootyWire page stays fresh before it is fetched again
+HTTP_CACHE_EXPIRE = 86400
+
+# Seconds parsed player details (age, draft pick, ...) stay cached; these
+# rarely change, so they outlive the raw page cache
+PLAYER_DETAILS_CACHE_EXPIRE = 7 * 86400
+
+# Patterns used when parsing player detail pages, compiled once
+_AGE_RE = re.compile(r'(\d+)')
+_DRAFT_RE = re.compile(r'#(\d+)')
+# Injury keywords ('injury', 'injured', 'suspension', 'suspended',
+# 'out for season') as one alternation, so the page is scanned once
+_INJURY_RE = re.compile(r'injur(?:y|ed)|suspen(?:sion|ded)|out for season')
+
+# Exact FootyWire position labels -> standard position; other labels fall
+# back to the substring rules in AFLDataCollector._normalize_position
+_POS_MAP = {
+    'D': 'DEF', 'DEF': 'DEF', 'BACK': 'DEF', 'DEFENDER': 'DEF',
+    'M': 'MID', 'MID': 'MID', 'MIDFIELDER': 'MID',
+    'R': 'RUC', 'RUC': 'RUC', 'RUCK': 'RUC',
+    'F': 'FWD', 'FWD': 'FWD', 'FORWARD': 'FWD',
+}
+
+# Coefficients for estimating detailed stats of scraped players from their
+# average score: stat = avg_score / divisor, kicks = disposals * kick_share and
+# hitouts = hitouts_base + avg_score / hitouts_div (inf means no score share)
+ESTIMATE_STAT_PARAMS = {
+    'MID': {'disposals_div': 2.5, 'kick_share': 0.55, 'marks_div': 20, 'tackles_div': 25,
+            'goals_div': 120, 'behinds_div': 80, 'hitouts_base': 0.5, 'hitouts_div': np.inf},
+    'DEF': {'disposals_div': 2.8, 'kick_share': 0.65, 'marks_div': 18, 'tackles_div': 30,
+            'goals_div': 200, 'behinds_div': 150, 'hitouts_base': 0.2, 'hitouts_div': np.inf},
+    'FWD': {'disposals_div': 3.5, 'kick_share': 0.55, 'marks_div': 22, 'tackles_div': 35,
+            'goals_div': 40, 'behinds_div': 70, 'hitouts_base': 0.3, 'hitouts_div': np.inf},
+    'RUC': {'disposals_div': 4, 'kick_share': 0.5, 'marks_div': 25, 'tackles_div': 35,
+            'goals_div': 150, 'behinds_div': 120, 'hitouts_base': 0.0, 'hitouts_div': 4},
+}
+ESTIMATE_STAT_COLUMNS = ('disposals_div', 'kick_share', 'marks_div', 'tackles_div',
+                         'goals_div', 'behinds_div', 'hitouts_base', 'hitouts_div')
+ESTIMATE_STAT_TABLE = np.array(
+    [[ESTIMATE_STAT_PARAMS[pos][col] for col in ESTIMATE_STAT_COLUMNS] for pos in POSITIONS]
+)
+
+# XPath for the first table carrying a CSS class (matched as a whole token)
+_FIRST_TABLE_XPATH = '(//table[contains(concat(" ", normalize-space(@class), " "), " {cls} ")])[1]'
+
+# Player stats rows that carry career totals or recent-season game counts
+_SEASON_ROW_RE = re.compile(r'Career|Total|2025|2024')
+
+# Translation table that strips currency formatting from prices
+_PRICE_STRIP = str.maketrans('', '', '$,')
+
+# Main content containers of a FootyWire page, most specific first
+_CONTENT_XPATHS = ('//div[@id="content"]', '//main', '//body')
+
+# Worker threads used to fetch player detail pages concurrently
+DETAIL_FETCH_WORKERS = 16
+
+# Contiguous per-player arrays for array-based optimizers (pos_code indexes POSITIONS)
+PlayerArrays = namedtuple('PlayerArrays', 'prices scores pos_code n')
+
+# Column dtypes for player data, used to parse CSV files without type inference
+# and to narrow scraped data
+PLAYER_DTYPES = {
+    'team': 'category', 'position': 'category',
+    'age': 'int16', 'games_played': 'int16', 'price': 'int32',
+    'avg_disposals': 'float32', 'avg_kicks': 'float32', 'avg_handballs': 'float32',
+    'avg_marks': 'float32', 'avg_tackles': 'float32', 'avg_goals': 'float32',
+    'avg_behinds': 'float32', 'avg_hitouts': 'float32', 'avg_score': 'float32',
+    'potential': 'float32', 'draft_pick': 'int16', 'draft_value': 'float32',
+    'injured_last_year': 'int8', 'injury_history': 'int8', 'games_last_3': 'int8',
+    'form_last_5': 'float32',
+}
+
+# File extension -> storage format used by save_data/load_data
+DATA_FORMATS = {'.parquet': 'parquet', '.feather': 'feather', '.arrow': 'feather', '.csv': 'csv'}
+
+# Bump whenever load_sample_data draws differently, so stale caches are regenerated
+SAMPLE_DATA_VERSION = 3
+
+# Sample data distributions per position: (mean, std) for normal draws,
+# (low, high) for the share of disposals that are kicks
+SAMPLE_STAT_PARAMS = {
+    'MID': {'disposals': (25, 5), 'kick_ratio': (0.5, 0.6), 'marks': (5, 2),
+            'tackles': (5, 2), 'goals': (0.8, 0.4), 'behinds': (0.5, 0.3), 'hitouts': (0.5, 0.3)},
+    'DEF': {'disposals': (20, 4), 'kick_ratio': (0.6, 0.7), 'marks': (6, 2),
+            'tackles': (4, 2), 'goals': (0.3, 0.2), 'behinds': (0.5, 0.3), 'hitouts': (0.2, 0.2)},
+    'FWD': {'disposals': (18, 4), 'kick_ratio': (0.5, 0.6), 'marks': (5, 2),
+            'tackles': (3, 1.5), 'goals': (2, 0.8), 'behinds': (0.5, 0.3), 'hitouts': (0.3, 0.2)},
+    'RUC': {'disposals': (15, 3), 'kick_ratio': (0.5, 0.6), 'marks': (4, 1.5),
+            'tackles': (3, 1.5), 'goals': (0.5, 0.3), 'behinds': (0.5, 0.3), 'hitouts': (30, 8)},
+}
+
+# The same parameters as float32 lookup tables indexed [position code, stat, param],
+# so every normally distributed stat can be drawn for all players at once
+SAMPLE_NORMAL_STATS = ('disposals', 'marks', 'tackles', 'goals', 'behinds', 'hitouts')
+SAMPLE_NORMAL_TABLE = np.array(
+    [[SAMPLE_STAT_PARAMS[pos][stat] for stat in SAMPLE_NORMAL_STATS] for pos in POSITIONS],
+    dtype=np.float32,
+)
+SAMPLE_KICK_RATIO_TABLE = np.array(
+    [SAMPLE_STAT_PARAMS[pos]['kick_ratio'] for pos in POSITIONS], dtype=np.float32
+)
+
+
+def _parse_int(text, default=0):
+    """Parse an integer (surrounding whitespace allowed), or return default"""
+    try:
+        return int(text)
+    except ValueError:
+        return default
 
 
 class AFLDataCollector:
     """Collects and manages AFL player data from FootyWire"""
     
-    def __init__(self):
+    def __init__(self, cache_path=os.path.join(config.CACHE_DIR, 'sample_players.parquet'),
+                 http_cache_dir=os.path.join(config.CACHE_DIR, 'http')):
         self.players_data = None
+        self._position_index = None  # Position -> row positions, built at load time
+        self._by_position = None  # Position -> players DataFrame, built at load time
+        self._arrays = None  # PlayerArrays, built at load time
+        self.cache_path = cache_path  # Generated sample data is cached next to this path (None disables)
         self.real_data_url = "https://www.footywire.com/afl/footy/supercoach_prices"
         self.base_url = "https://www.footywire.com"
+        self.http_cache_dir = http_cache_dir  # Fetched pages are cached here (None disables)
+        self.request_delay = 0.5  # Minimum seconds between network requests
+        self.session = requests.Session()
+        self.session.headers.update(HTTP_HEADERS)
+        # Keep enough pooled keep-alive connections for the default number of
+        # detail-fetch workers and retry transient failures with backoff
+        adapter = HTTPAdapter(
+            pool_connections=DETAIL_FETCH_WORKERS * 2,
+            pool_maxsize=DETAIL_FETCH_WORKERS * 2,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._request_lock = threading.Lock()
+        self._next_request = 0.0  # Earliest time the next network request may start
     
-    def calculate_potential(self, age):
+    @staticmethod
+    def calculate_potential(age):
+        """Calculate player potential for a single age (see calculate_potential_vec)"""
+        return float(AFLDataCollector.calculate_potential_vec(np.array([age]))[0])
+    
+    @staticmethod
+    def calculate_potential_vec(ages):
         """
-        Calculate player potential based on age
+        Calculate player potential based on age, for a whole array of ages
         Peak age for AFL is typically 24-28
         Young players (18-23) have high potential for growth
         Players 29+ are declining
         """
-        if age < 18:
-            return 0.5
-        elif age <= 21:
-            # Young players with high potential
-            return 1.0 + (21 - age) * 0.1  # Up to 1.3 for 18 year olds
-        elif age <= 24:
-            # Developing players
-            return 1.0 + (24 - age) * 0.05  # Up to 1.15 for 21 year olds
-        elif age <= 28:
-            # Peak performance age
-            return 1.0
-        elif age <= 32:
-            # Slight decline
-            return 1.0 - (age - 28) * 0.05  # Down to 0.8 for 32 year olds
-        else:
-            # Veterans
-            return max(0.5, 1.0 - (age - 28) * 0.08)  # Declining rapidly
+        a = np.asarray(ages, dtype=np.float64)
+        conditions = [a < 18, a <= 21, a <= 24, a <= 28, a <= 32]
+        values = [
+            0.5,
+            1.0 + (21 - a) * 0.1,   # Young players with high potential, up to 1.3 for 18 year olds
+            1.0 + (24 - a) * 0.05,  # Developing players, up to 1.15 for 21 year olds
+            1.0,                    # Peak performance age
+            1.0 - (a - 28) * 0.05,  # Slight decline, down to 0.8 for 32 year olds
+        ]
+        # Veterans are declining rapidly
+        return np.select(conditions, values, default=np.maximum(0.5, 1.0 - (a - 28) * 0.08))
+    
+    def fetch_page(self, url, timeout=15):
+        """
+        Fetch a page's HTML, reusing an on-disk copy younger than HTTP_CACHE_EXPIRE
+        
+        Network requests share one keep-alive session and their start times are
+        spaced at least request_delay seconds apart (across threads) to be
+        respectful to the server; cache hits return immediately.
+        """
+        cache_file = self._cache_file(url, '.html')
+        if self._is_fresh(cache_file, HTTP_CACHE_EXPIRE):
+            with open(cache_file, encoding='utf-8') as f:
+                return f.read()
+        
+        # Reserve the next request slot; safe to call from several threads
+        with self._request_lock:
+            start = max(time.time(), self._next_request)
+            self._next_request = start + self.request_delay
+        wait = start - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        
+        if cache_file:
+            os.makedirs(self.http_cache_dir, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                f.write(response.text)
+        return response.text
+    
+    def _cache_file(self, url, extension):
+        """Content-addressed cache path for a URL (None when caching is disabled)"""
+        if not self.http_cache_dir:
+            return None
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.http_cache_dir, key + extension)
+    
+    def _is_fresh(self, cache_file, max_age):
+        """Whether a cache file exists and is younger than max_age seconds"""
+        return (cache_file is not None and os.path.exists(cache_file)
+                and time.time() - os.path.getmtime(cache_file) < max_age)
     
     def get_player_details(self, player_url):
         """
         Fetch detailed player information from individual player page
         Including: age, draft pick, injury history, career stats
+        
+        Parsed details are cached on disk for PLAYER_DETAILS_CACHE_EXPIRE
+        seconds, so repeat runs skip both the request and the parse.
         """
+        cache_file = self._cache_file(player_url, '.json')
+        if self._is_fresh(cache_file, PLAYER_DETAILS_CACHE_EXPIRE):
+            with open(cache_file, encoding='utf-8') as f:
+                return json.load(f)
+        
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(player_url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            details = {}
-            
-            # Try to extract age, draft info from player info table
-            info_table = soup.find('table', {'class': 'playerno'})
-            if info_table:
-                rows = info_table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 2:
-                        label = cells[0].text.strip().lower()
-                        value = cells[1].text.strip()
-                        
-                        if 'age' in label or 'born' in label:
-                            # Extract age number
-                            age_match = re.search(r'(\d+)', value)
-                            if age_match:
-                                details['age'] = int(age_match.group(1))
-                        elif 'draft' in label:
-                            # Extract draft pick number
-                            draft_match = re.search(r'#(\d+)', value)
-                            if draft_match:
-                                details['draft_pick'] = int(draft_match.group(1))
-                            elif 'rookie' in value.lower():
-                                details['draft_pick'] = 999  # Rookie draft
-                            elif 'undrafted' in value.lower():
-                                details['draft_pick'] = 1000  # Undrafted
-                        elif 'height' in label:
-                            details['height'] = value
-                        elif 'weight' in label:
-                            details['weight'] = value
-            
-            # Try to extract career stats and injury info
-            stats_table = soup.find('table', {'class': 'data'})
-            if stats_table:
-                # Get career totals or averages
-                rows = stats_table.find_all('tr')
-                for row in rows:
-                    if 'Career' in row.text or 'Total' in row.text:
-                        cells = row.find_all('td')
-                        if len(cells) > 5:
-                            try:
-                                details['games_played'] = int(cells[1].text.strip())
-                            except:
-                                pass
-                    
-                    # Check for injury indicators in recent seasons (last 2 years)
-                    # Look for low game counts or injury notes
-                    if '2025' in row.text or '2024' in row.text:
-                        cells = row.find_all('td')
-                        if len(cells) > 1:
-                            try:
-                                games_in_season = int(cells[1].text.strip())
-                                # If played very few games, likely injured
-                                if games_in_season < 5:
-                                    details['injured_last_year'] = True
-                            except:
-                                pass
-            
-            # Look for injury notes in the page text
-            page_text = soup.get_text().lower()
-            injury_keywords = ['injury', 'injured', 'suspension', 'suspended', 'out for season']
-            for keyword in injury_keywords:
-                if keyword in page_text:
-                    details['injured_last_year'] = True
-                    break
+            details = self._parse_player_details(self.fetch_page(player_url))
+        except (requests.RequestException, ValueError, OSError):
+            return {}
+        
+        if cache_file:
+            os.makedirs(self.http_cache_dir, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(details, f)
+        return details
+    
+    def _content_text(self, doc):
+        """
+        Text of a page's main content, skipping head and site boilerplate
+        
+        Uses the first of _CONTENT_XPATHS that matches (the whole body as a
+        last resort), read with a single XPath string() call.
+        """
+        for xpath in _CONTENT_XPATHS:
+            if doc.xpath(xpath):
+                return doc.xpath(f'string({xpath}[1])')
+        return doc.text_content()
+    
+    def _parse_player_details(self, html):
+        """Extract player details from the HTML of a player page"""
+        doc = lxml.html.fromstring(html)
+        # Script/style text is not page content
+        for element in doc.xpath('//script | //style'):
+            element.drop_tree()
+        
+        details = {}
+        
+        # Try to extract age, draft info from player info table
+        for row in doc.xpath(_FIRST_TABLE_XPATH.format(cls='playerno') + '//tr'):
+            cells = row.xpath('.//td')
+            if len(cells) >= 2:
+                label = cells[0].text_content().strip().lower()
+                value = cells[1].text_content().strip()
+                
+                if 'age' in label or 'born' in label:
+                    # Extract age number
+                    age_match = _AGE_RE.search(value)
+                    if age_match:
+                        details['age'] = int(age_match.group(1))
+                elif 'draft' in label:
+                    # Extract draft pick number
+                    draft_match = _DRAFT_RE.search(value)
+                    if draft_match:
+                        details['draft_pick'] = int(draft_match.group(1))
+                    elif 'rookie' in value.lower():
+                        details['draft_pick'] = 999  # Rookie draft
+                    elif 'undrafted' in value.lower():
+                        details['draft_pick'] = 1000  # Undrafted
+                elif 'height' in label:
+                    details['height'] = value
+                elif 'weight' in label:
+                    details['weight'] = value
+        
+        # Try to extract career stats and injury info; only career-total and
+        # recent-season rows matter, so rows are gated by one regex and their
+        # cells are read once for both checks
+        for row in doc.xpath(_FIRST_TABLE_XPATH.format(cls='data') + '//tr'):
+            row_text = row.text_content()
+            if not _SEASON_ROW_RE.search(row_text):
+                continue
+            cells = row.xpath('.//td')
+            if len(cells) < 2:
+                continue
+            games = _parse_int(cells[1].text_content(), None)
+            if games is None:
+                continue
             
-            return details
+            # Get career totals or averages
+            if len(cells) > 5 and ('Career' in row_text or 'Total' in row_text):
+                details['games_played'] = games
             
-        except Exception as e:
-            return {}
+            # Check for injury indicators in recent seasons (last 2 years)
+            # Look for low game counts or injury notes
+            if ('2025' in row_text or '2024' in row_text) and games < 5:
+                # If played very few games, likely injured
+                details['injured_last_year'] = True
+        
+        # Look for injury notes in the page text
+        page_text = self._content_text(doc).lower()
+        if _INJURY_RE.search(page_text):
+            details['injured_last_year'] = True
+        
+        return details
     
-    def load_real_data(self, fetch_player_details=False):
+    def load_real_data(self, fetch_player_details=False, detail_workers=DETAIL_FETCH_WORKERS, seed=None):
         """
         Load real AFL Supercoach player data from FootyWire
         
         Parameters:
         - fetch_player_details: If True, fetches detailed info for each player (slow)
+        - detail_workers: Number of detail pages fetched concurrently
+        - seed: Seed for the random estimates of missing fields (None = unseeded)
         """
         try:
             print("Fetching real player data from FootyWire...")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(self.real_data_url, headers=headers, timeout=30)
-            response.raise_for_status()
+            html = self.fetch_page(self.real_data_url, timeout=30)
             
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Parse the player table (first table with class token "data", as
+            # in the detail pages) in one lxml pass; cells come back as
+            # (text, href) pairs so player links are kept
+            nodes = lxml.html.fromstring(html).xpath(_FIRST_TABLE_XPATH.format(cls='data'))
+            table = None
+            if nodes:
+                try:
+                    table = pd.read_html(StringIO(lxml.html.tostring(nodes[0], encoding='unicode')),
+                                         flavor='lxml', header=0, extract_links='body')[0]
+                except ValueError:
+                    pass
             
-            # Find the table with player data
-            table = soup.find('table', {'class': 'data'})
-            
-            if not table:
+            if table is None or table.shape[1] < 7:
                 print("Could not find player data table. Using sample data instead.")
                 return self.load_sample_data()
             
-            # Extract table data
-            players = []
-            rows = table.find_all('tr')[1:]  # Skip header
+            print(f"Processing {len(table)} players...")
+            
+            # Phase 1: clean the price table column-wise, skipping short rows
+            table = table[table.iloc[:, 6].notna()]
+            cell_text = {i: table.iloc[:, i].str[0].fillna('').str.strip() for i in range(6)}
+            hrefs = table.iloc[:, 0].str[1]
             
-            print(f"Processing {len(rows)} players...")
+            # Parse price (remove $ and commas in one translate pass); to_numeric
+            # validates while parsing, so no separate isdigit scan is needed
+            price = pd.to_numeric(cell_text[3].str.translate(_PRICE_STRIP), errors='coerce')
             
-            for idx, row in enumerate(rows):
-                cols = row.find_all('td')
-                if len(cols) >= 7:
-                    try:
-                        # Extract player information
-                        player_link = cols[0].find('a')
-                        name = player_link.text.strip() if player_link else cols[0].text.strip()
-                        player_url = None
-                        if player_link and player_link.get('href'):
-                            player_url = self.base_url + player_link.get('href')
-                        
-                        team = cols[1].text.strip()
-                        position = cols[2].text.strip()
-                        
-                        # Parse price (remove $ and commas)
-                        price_text = cols[3].text.strip().replace('$', '').replace(',', '')
-                        price = int(price_text) if price_text.isdigit() else 0
-                        
-                        # Get average score if available
-                        avg_score_text = cols[4].text.strip()
-                        avg_score = float(avg_score_text) if avg_score_text and avg_score_text != '-' else 0.0
-                        
-                        # Get games played if available
-                        games_text = cols[5].text.strip() if len(cols) > 5 else '0'
-                        games_played = int(games_text) if games_text.isdigit() else 0
-                        
-                        # Fetch detailed player info from FootyWire links (for ALL players, no limit)
-                        age = None
-                        draft_pick = None
-                        injured_last_year = False
-                        
-                        if fetch_player_details and player_url:
-                            print(f"  Fetching details for {name} ({idx+1}/{len(rows)})...")
-                            details = self.get_player_details(player_url)
-                            age = details.get('age')
-                            draft_pick = details.get('draft_pick')
-                            injured_last_year = details.get('injured_last_year', False)
-                            if 'games_played' in details:
-                                games_played = details['games_played']
-                            time.sleep(0.5)  # Be respectful to the server
-                        
-                        # Estimate age if not fetched
-                        if age is None:
-                            if games_played > 0:
-                                # Estimate based on games: avg 2 years per 44 games
-                                age = int(18 + (games_played / 22))
-                                age = max(18, min(35, age))
-                            else:
-                                age = int(np.random.normal(25, 4))
-                                age = max(18, min(35, age))
-                        
-                        # Estimate draft pick if not fetched
-                        if draft_pick is None:
-                            # Estimate based on performance and age
-                            # Better players likely had earlier picks
-                            if avg_score > 100:
-                                draft_pick = int(np.random.uniform(1, 20))
-                            elif avg_score > 80:
-                                draft_pick = int(np.random.uniform(10, 40))
-                            elif avg_score > 60:
-                                draft_pick = int(np.random.uniform(20, 60))
-                            else:
-                                draft_pick = int(np.random.uniform(30, 100))
-                        
-                        # Calculate draft pick value (early picks more valuable)
-                        draft_value = max(0, 100 - draft_pick) / 100  # 0-1 scale
-                        
-                        # Create player entry
-                        if price > 0:  # Only include players with valid prices
-                            player = {
-                                'player_id': f'FW{len(players):04d}',
-                                'name': name,
-                                'team': team,
-                                'position': self._normalize_position(position),
-                                'age': age,
-                                'games_played': games_played,
-                                'avg_score': avg_score if avg_score > 0 else self._estimate_score(price),
-                                'price': price,
-                                'potential': self.calculate_potential(age),
-                                'draft_pick': draft_pick,
-                                'draft_value': draft_value,
-                                'injured_last_year': 1 if injured_last_year else 0,
-                                'injury_history': int(np.random.exponential(1)) + (2 if injured_last_year else 0),
-                                'games_last_3': 0 if injured_last_year else min(3, int(np.random.uniform(0, 4))),
-                                'form_last_5': avg_score * np.random.uniform(0.9, 1.1) if avg_score > 0 else self._estimate_score(price) * np.random.uniform(0.9, 1.1)
-                            }
-                            
-                            # Add estimated stats based on position and score
-                            player.update(self._estimate_stats(player))
-                            
-                            players.append(player)
-                    except (ValueError, AttributeError, IndexError) as e:
-                        continue  # Skip rows with parsing errors
+            # Get average score and games played if available
+            avg_score = pd.to_numeric(cell_text[4], errors='coerce')
+            games_played = pd.to_numeric(cell_text[5], errors='coerce')
             
-            if players:
-                self.players_data = pd.DataFrame(players)
-                print(f"✓ Loaded {len(players)} real players from FootyWire")
+            parsed = pd.DataFrame({
+                'name': cell_text[0],
+                'team': cell_text[1],
+                'position': self._normalize_positions(cell_text[2]),
+                'price': price.fillna(0).astype(np.int64),
+                'avg_score': avg_score.fillna(0.0),
+                'games_played': games_played.fillna(0).astype(np.int64),
+                'player_url': (self.base_url + hrefs).where(hrefs.notna() & (hrefs != ''), None),
+            })
+            # Only include players with valid prices
+            parsed = parsed[parsed['price'] > 0].reset_index(drop=True)
+            num_players = len(parsed)
+            
+            # Phase 2: fetch detailed player info from FootyWire links (for ALL
+            # players, no limit) concurrently; fetch_page keeps requests spaced
+            # request_delay apart, so the pool overlaps latency, not load
+            details_list = [{}] * num_players
+            if fetch_player_details:
+                urls = parsed['player_url']
+                has_url = urls.notna().to_numpy()
+                print(f"  Fetching details for {int(has_url.sum())} players...")
+                with ThreadPoolExecutor(max_workers=detail_workers) as executor:
+                    fetched = iter(executor.map(self.get_player_details, urls[has_url]))
+                details_list = [next(fetched) if url else {} for url in has_url]
+            
+            # Phase 3: combine table values, fetched details and estimates as
+            # whole columns; all random estimates are drawn in one batch each
+            rng = np.random.default_rng(seed)
+            details = pd.DataFrame(details_list, index=parsed.index,
+                                   columns=['age', 'draft_pick', 'injured_last_year', 'games_played'])
+            table_score = parsed['avg_score'].to_numpy(dtype=np.float64)
+            price = parsed['price'].to_numpy(dtype=np.int32)
+            games_played = details['games_played'].fillna(parsed['games_played']).to_numpy(dtype=np.int16)
+            injured = details['injured_last_year'].eq(True).to_numpy()
+            
+            # Estimate age if not fetched: avg 2 years per 44 games, or a
+            # random age for players without games
+            fetched_age = details['age'].to_numpy(dtype=np.float64)
+            estimated_age = np.where(games_played > 0, 18 + games_played / 22,
+                                     rng.normal(25, 4, num_players)).astype(np.int16)
+            age = np.where(np.isnan(fetched_age), np.clip(estimated_age, 18, 35),
+                           fetched_age).astype(np.int16)
+            
+            # Estimate draft pick if not fetched
+            # Better players likely had earlier picks
+            fetched_pick = details['draft_pick'].to_numpy(dtype=np.float64)
+            bands = [table_score > 100, table_score > 80, table_score > 60]
+            draft_low = np.select(bands, [1, 10, 20], default=30)
+            draft_high = np.select(bands, [20, 40, 60], default=100)
+            draft_pick = np.where(np.isnan(fetched_pick), rng.uniform(draft_low, draft_high).astype(np.int16),
+                                  fetched_pick).astype(np.int16)
+            
+            avg_score = np.where(table_score > 0, table_score, self._estimate_score(price, rng))
+            injured_last_year = injured.astype(np.int8)
+            injury_history = (rng.exponential(1, num_players).astype(np.int8) + injured_last_year * 2).astype(np.int8)
+            games_last_3 = np.where(injured, 0,
+                                    np.minimum(3, rng.uniform(0, 4, num_players).astype(np.int8))).astype(np.int8)
+            form_last_5 = avg_score * rng.uniform(0.9, 1.1, num_players)
+            
+            # Calculate draft pick value (early picks more valuable)
+            draft_value = np.maximum(0, 100 - draft_pick) / 100  # 0-1 scale
+            
+            if num_players:
+                self.players_data = pd.DataFrame({
+                    'player_id': [f'FW{i:04d}' for i in range(num_players)],
+                    'name': parsed['name'],
+                    'team': parsed['team'],
+                    'position': parsed['position'],
+                    'age': age,
+                    'games_played': games_played,
+                    'avg_score': avg_score,
+                    'price': price,
+                    'potential': self.calculate_potential_vec(age),
+                    'draft_pick': draft_pick,
+                    'draft_value': draft_value,
+                    'injured_last_year': injured_last_year,
+                    'injury_history': injury_history,
+                    'games_last_3': games_last_3,
+                    'form_last_5': form_last_5,
+                }, copy=False)
+                
+                # Add estimated stats based on position and score, as whole columns
+                estimated = self._estimate_stats(
+                    self.players_data['position'].to_numpy(),
+                    self.players_data['avg_score'].to_numpy(dtype=np.float64),
+                )
+                for column, values in estimated.items():
+                    self.players_data[column] = values
+                
+                # Store every column with the same narrow dtypes as the sample data
+                self.players_data = self.players_data.astype(PLAYER_DTYPES, copy=False)
+                self._index_players()
+                print(f"✓ Loaded {num_players} real players from FootyWire")
                 print(f"  Age range: {self.players_data['age'].min()}-{self.players_data['age'].max()}")
                 print(f"  Potential range: {self.players_data['potential'].min():.2f}-{self.players_data['potential'].max():.2f}")
                 return self.players_data
@@ -270,14 +487,22 @@ class AFLDataCollector:
             print("Falling back to sample data...")
             return self.load_sample_data()
     
-    def _estimate_score(self, price):
-        """Estimate average score from price"""
+    def _estimate_score(self, price, rng):
+        """Estimate average score from price (a scalar or an array of prices)"""
         # Rough approximation: $500k ~ 80 points
-        return (price / 6000) + np.random.normal(0, 5)
+        return (np.asarray(price) / 6000) + rng.normal(0, 5, np.shape(price))
+    
+    def _normalize_positions(self, positions):
+        """Normalize a column of position names, resolving each distinct label once"""
+        labels = pd.Series(positions).str.upper().str.strip()
+        lookup = {label: self._normalize_position(label) for label in labels.unique()}
+        return labels.map(lookup)
     
     def _normalize_position(self, position):
         """Normalize position names to standard format"""
         position = position.upper().strip()
+        if position in _POS_MAP:
+            return _POS_MAP[position]
         
         # Map common position variations
         if 'DEF' in position or 'BACK' in position or position == 'D':
@@ -292,218 +517,283 @@ class AFLDataCollector:
             # Default to MID for utility players
             return 'MID'
     
-    def _estimate_stats(self, player):
-        """Estimate detailed stats based on position and average score"""
-        position = player['position']
-        avg_score = player['avg_score']
+    def _estimate_stats(self, positions, avg_scores):
+        """
+        Estimate detailed stats based on position and average score
         
+        Works on whole columns: positions and avg_scores are arrays, and the
+        result maps each avg_* stat column to an array of estimates.
+        """
         # Reverse engineer stats from supercoach scoring
         # Score = kicks*3 + handballs*2 + marks*3 + tackles*4 + goals*6 + behinds*1 + hitouts*1
+        pos_code = pd.Categorical(positions, categories=POSITIONS).codes
+        coeffs = ESTIMATE_STAT_TABLE[pos_code]  # (num_players, len(ESTIMATE_STAT_COLUMNS))
+        (disposals_div, kick_share, marks_div, tackles_div, goals_div,
+         behinds_div, hitouts_base, hitouts_div) = coeffs.T
         
-        if position == 'MID':
-            disposals = avg_score / 2.5
-            kicks = disposals * 0.55
-            handballs = disposals * 0.45
-            marks = avg_score / 20
-            tackles = avg_score / 25
-            goals = avg_score / 120
-            behinds = avg_score / 80
-            hitouts = 0.5
-        elif position == 'DEF':
-            disposals = avg_score / 2.8
-            kicks = disposals * 0.65
-            handballs = disposals * 0.35
-            marks = avg_score / 18
-            tackles = avg_score / 30
-            goals = avg_score / 200
-            behinds = avg_score / 150
-            hitouts = 0.2
-        elif position == 'FWD':
-            disposals = avg_score / 3.5
-            kicks = disposals * 0.55
-            handballs = disposals * 0.45
-            marks = avg_score / 22
-            tackles = avg_score / 35
-            goals = avg_score / 40
-            behinds = avg_score / 70
-            hitouts = 0.3
-        else:  # RUC
-            disposals = avg_score / 4
-            kicks = disposals * 0.5
-            handballs = disposals * 0.5
-            marks = avg_score / 25
-            tackles = avg_score / 35
-            goals = avg_score / 150
-            behinds = avg_score / 120
-            hitouts = avg_score / 4
+        disposals = avg_scores / disposals_div
+        kicks = disposals * kick_share
+        handballs = disposals * (1 - kick_share)
         
         return {
-            'avg_disposals': round(kicks + handballs, 2),
-            'avg_kicks': round(kicks, 2),
-            'avg_handballs': round(handballs, 2),
-            'avg_marks': round(marks, 2),
-            'avg_tackles': round(tackles, 2),
-            'avg_goals': round(goals, 2),
-            'avg_behinds': round(behinds, 2),
-            'avg_hitouts': round(hitouts, 2)
+            'avg_disposals': np.round(kicks + handballs, 2),
+            'avg_kicks': np.round(kicks, 2),
+            'avg_handballs': np.round(handballs, 2),
+            'avg_marks': np.round(avg_scores / marks_div, 2),
+            'avg_tackles': np.round(avg_scores / tackles_div, 2),
+            'avg_goals': np.round(avg_scores / goals_div, 2),
+            'avg_behinds': np.round(avg_scores / behinds_div, 2),
+            'avg_hitouts': np.round(hitouts_base + avg_scores / hitouts_div, 2),
         }
     
-    def load_sample_data(self):
+    def load_sample_data(self, seed=42):
         """
         Generate sample player data for demonstration
         In production, this would scrape from AFL APIs or databases
-        """
-        np.random.seed(42)
-        
-        # AFL teams
-        teams = [
-            'Adelaide', 'Brisbane', 'Carlton', 'Collingwood', 'Essendon',
-            'Fremantle', 'Geelong', 'Gold Coast', 'GWS', 'Hawthorn',
-            'Melbourne', 'North Melbourne', 'Port Adelaide', 'Richmond',
-            'St Kilda', 'Sydney', 'West Coast', 'Western Bulldogs'
-        ]
-        
-        # Positions
-        positions = ['DEF', 'MID', 'RUC', 'FWD']
-        
-        # Generate 400+ players
-        num_players = 450
-        players = []
         
-        for i in range(num_players):
-            position = np.random.choice(positions)
-            team = np.random.choice(teams)
-            
-            # Age distribution (18-35)
-            age = int(np.random.normal(25, 4))
-            age = max(18, min(35, age))
-            
-            # Games played (influenced by age)
-            games_played = int(np.random.exponential(50) * (age - 17) / 10)
-            games_played = max(0, min(300, games_played))
-            
-            # Performance stats (position-dependent)
-            if position == 'MID':
-                avg_disposals = np.random.normal(25, 5)
-                avg_kicks = avg_disposals * np.random.uniform(0.5, 0.6)
-                avg_handballs = avg_disposals - avg_kicks
-                avg_marks = np.random.normal(5, 2)
-                avg_tackles = np.random.normal(5, 2)
-                avg_goals = np.random.normal(0.8, 0.4)
-                avg_hitouts = np.random.normal(0.5, 0.3)
-            elif position == 'DEF':
-                avg_disposals = np.random.normal(20, 4)
-                avg_kicks = avg_disposals * np.random.uniform(0.6, 0.7)
-                avg_handballs = avg_disposals - avg_kicks
-                avg_marks = np.random.normal(6, 2)
-                avg_tackles = np.random.normal(4, 2)
-                avg_goals = np.random.normal(0.3, 0.2)
-                avg_hitouts = np.random.normal(0.2, 0.2)
-            elif position == 'FWD':
-                avg_disposals = np.random.normal(18, 4)
-                avg_kicks = avg_disposals * np.random.uniform(0.5, 0.6)
-                avg_handballs = avg_disposals - avg_kicks
-                avg_marks = np.random.normal(5, 2)
-                avg_tackles = np.random.normal(3, 1.5)
-                avg_goals = np.random.normal(2, 0.8)
-                avg_hitouts = np.random.normal(0.3, 0.2)
-            else:  # RUC
-                avg_disposals = np.random.normal(15, 3)
-                avg_kicks = avg_disposals * np.random.uniform(0.5, 0.6)
-                avg_handballs = avg_disposals - avg_kicks
-                avg_marks = np.random.normal(4, 1.5)
-                avg_tackles = np.random.normal(3, 1.5)
-                avg_goals = np.random.normal(0.5, 0.3)
-                avg_hitouts = np.random.normal(30, 8)
-            
-            # Ensure non-negative values
-            avg_disposals = max(0, avg_disposals)
-            avg_kicks = max(0, avg_kicks)
-            avg_handballs = max(0, avg_handballs)
-            avg_marks = max(0, avg_marks)
-            avg_tackles = max(0, avg_tackles)
-            avg_goals = max(0, avg_goals)
-            avg_hitouts = max(0, avg_hitouts)
-            avg_behinds = max(0, np.random.normal(0.5, 0.3))
-            
-            # Calculate average score (Supercoach scoring)
-            avg_score = (
-                avg_kicks * 3 +
-                avg_handballs * 2 +
-                avg_marks * 3 +
-                avg_tackles * 4 +
-                avg_goals * 6 +
-                avg_behinds * 1 +
-                avg_hitouts * 1
-            )
-            
-            # Price based on average score and some noise
-            base_price = avg_score * 6000 + np.random.normal(50000, 30000)
-            price = int(max(100000, min(800000, base_price)))
-            
-            # Additional features
-            injured_last_year = 1 if np.random.random() < 0.15 else 0  # 15% injury rate
-            injury_history = int(np.random.exponential(1)) + (2 if injured_last_year else 0)
-            games_last_3 = 0 if injured_last_year else min(3, int(np.random.uniform(0, 4)))
-            form_last_5 = avg_score * np.random.uniform(0.8, 1.2)
-            
-            # Draft pick estimation (better players likely earlier picks)
-            if avg_score > 100:
-                draft_pick = int(np.random.uniform(1, 20))
-            elif avg_score > 80:
-                draft_pick = int(np.random.uniform(10, 40))
-            elif avg_score > 60:
-                draft_pick = int(np.random.uniform(20, 60))
-            else:
-                draft_pick = int(np.random.uniform(30, 100))
-            
-            draft_value = max(0, 100 - draft_pick) / 100
-            potential = self.calculate_potential(age)
-            
-            player = {
-                'player_id': f'P{i:04d}',
-                'name': f'{np.random.choice(["Smith", "Jones", "Brown", "Wilson", "Taylor", "Johnson", "Williams", "Davis", "Miller", "Anderson"])} {np.random.choice(["Jack", "Tom", "Sam", "Luke", "Matt", "Josh", "Ben", "Dan", "Jake", "Alex"])}',
-                'team': team,
-                'position': position,
-                'age': age,
-                'games_played': games_played,
-                'avg_disposals': round(avg_disposals, 2),
-                'avg_kicks': round(avg_kicks, 2),
-                'avg_handballs': round(avg_handballs, 2),
-                'avg_marks': round(avg_marks, 2),
-                'avg_tackles': round(avg_tackles, 2),
-                'avg_goals': round(avg_goals, 2),
-                'avg_behinds': round(avg_behinds, 2),
-                'avg_hitouts': round(avg_hitouts, 2),
-                'avg_score': round(avg_score, 2),
-                'price': price,
-                'potential': potential,
-                'draft_pick': draft_pick,
-                'draft_value': draft_value,
-                'injured_last_year': injured_last_year,
-                'injury_history': injury_history,
-                'games_last_3': games_last_3,
-                'form_last_5': round(form_last_5, 2)
-            }
-            
-            players.append(player)
-        
-        self.players_data = pd.DataFrame(players)
+        Parameters:
+        - seed: Seed for the local random Generator (the global NumPy RNG is untouched);
+          None draws fresh data on every call, bypassing both sample data caches
+        """
+        if seed is None:
+            self.players_data = _generate_sample_data(None, config.NUM_PLAYERS)
+        else:
+            self.players_data = _sample_data(seed, config.NUM_PLAYERS, self.cache_path).copy()
+        self._index_players()
         return self.players_data
     
+    def _index_players(self):
+        """Store position/team as categoricals and pre-group players by position"""
+        df = self.players_data
+        df['position'] = pd.Categorical(df['position'], categories=POSITIONS)
+        df['team'] = df['team'].astype('category')
+        codes = df['position'].cat.codes.to_numpy()
+        self._position_index = {
+            pos: np.flatnonzero(codes == code) for code, pos in enumerate(POSITIONS)
+        }
+        self._by_position = {
+            pos: df.iloc[rows] for pos, rows in self._position_index.items()
+        }
+        self._arrays = PlayerArrays(
+            np.ascontiguousarray(df['price'].to_numpy(np.int32)),
+            np.ascontiguousarray(df['avg_score'].to_numpy(np.float32)),
+            codes.astype(np.int8),
+            len(df),
+        )
+    
     def get_players_by_position(self, position):
-        """Get all players for a specific position"""
+        """
+        Get all players for a specific position
+        
+        Returns a copy of the position subset indexed at load time, so
+        callers cannot alter the cache (a shallow copy would share its data
+        without pandas copy-on-write).
+        """
         if self.players_data is None:
             raise ValueError("No data loaded. Call load_sample_data() first.")
-        return self.players_data[self.players_data['position'] == position]
+        if self._by_position is None:
+            self._index_players()
+        if position not in self._by_position:
+            return self.players_data.iloc[0:0]
+        return self._by_position[position].copy()
     
-    def save_data(self, filepath):
-        """Save player data to CSV"""
+    def get_player_arrays(self):
+        """
+        Get prices, average scores and position codes as contiguous NumPy arrays
+        
+        The arrays are built once per load, so knapsack/ILP style optimizers
+        can use them directly instead of converting DataFrame columns.
+        """
+        if self.players_data is None:
+            raise ValueError("No data loaded. Call load_sample_data() first.")
+        if self._arrays is None:
+            self._index_players()
+        return self._arrays
+    
+    def _data_format(self, filepath, format):
+        """Resolve 'auto' to a storage format from the file extension"""
+        if format == 'auto':
+            ext = os.path.splitext(filepath)[1].lower()
+            format = DATA_FORMATS.get(ext, 'csv')
+        if format not in DATA_FORMATS.values():
+            raise ValueError(f"Unknown data format: {format}")
+        return format
+    
+    def save_data(self, filepath, format='auto'):
+        """
+        Save player data as Parquet, Feather (Arrow IPC) or CSV
+        
+        With format='auto' the format follows the file extension (.parquet,
+        .feather/.arrow, otherwise CSV). The binary formats store columns
+        as-is, without formatting every float as text.
+        """
         if self.players_data is not None:
-            self.players_data.to_csv(filepath, index=False)
+            format = self._data_format(filepath, format)
+            if format == 'parquet':
+                self.players_data.to_parquet(filepath, index=False, compression='zstd')
+            elif format == 'feather':
+                self.players_data.reset_index(drop=True).to_feather(filepath)
+            else:
+                self.players_data.to_csv(filepath, index=False)
             print(f"Data saved to {filepath}")
     
-    def load_data(self, filepath):
-        """Load player data from CSV"""
-        self.players_data = pd.read_csv(filepath)
+    def load_data(self, filepath, format='auto'):
+        """Load player data saved by save_data (format as in save_data)"""
+        format = self._data_format(filepath, format)
+        if format == 'parquet':
+            self.players_data = pd.read_parquet(filepath)
+        elif format == 'feather':
+            self.players_data = pd.read_feather(filepath)
+        else:
+            self.players_data = pd.read_csv(filepath, dtype=PLAYER_DTYPES, engine='pyarrow')
+        self._index_players()
         return self.players_data
+
+
+@functools.lru_cache(maxsize=4)
+def _sample_data(seed, num_players, cache_path):
+    """
+    Load or generate the sample player DataFrame for a (non-None) seed
+    
+    Memoized in-process, so repeated load_sample_data calls in one session
+    skip both the parquet read and the generation. Callers must not modify
+    the returned frame in place; load_sample_data hands out deep copies
+    (a shallow copy shares its data without pandas copy-on-write).
+    Unseeded draws must not come through here, or they would be frozen.
+    """
+    # Reuse previously generated sample data if it is cached on disk for the
+    # same generator version, seed and size. The key is part of the file
+    # name (Parquet only round-trips DataFrame.attrs from pandas 2.1)
+    if cache_path:
+        root, ext = os.path.splitext(cache_path)
+        cache_path = f'{root}-v{SAMPLE_DATA_VERSION}-{seed}-{num_players}{ext}'
+        if os.path.exists(cache_path):
+            return pd.read_parquet(cache_path)
+    
+    players = _generate_sample_data(seed, num_players)
+    if cache_path:
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        players.to_parquet(cache_path, index=False, compression='zstd')
+    return players
+
+
+def _generate_sample_data(seed, num_players):
+    """Generate the sample player DataFrame (seed None draws from fresh OS entropy)"""
+    rng = np.random.default_rng(seed)
+    
+    # AFL teams
+    teams = [
+        'Adelaide', 'Brisbane', 'Carlton', 'Collingwood', 'Essendon',
+        'Fremantle', 'Geelong', 'Gold Coast', 'GWS', 'Hawthorn',
+        'Melbourne', 'North Melbourne', 'Port Adelaide', 'Richmond',
+        'St Kilda', 'Sydney', 'West Coast', 'Western Bulldogs'
+    ]
+    
+    # Positions
+    positions = POSITIONS
+    
+    # Every column is drawn as a whole array and stored with a narrow
+    # dtype (structure of arrays, no per-row dicts)
+    pos_code = rng.integers(len(positions), size=num_players)
+    position = np.array(positions)[pos_code]
+    team = rng.choice(teams, num_players)
+    
+    # Age distribution (18-35)
+    age = np.clip(rng.normal(25, 4, num_players).astype(np.int16), 18, 35)
+    
+    # Games played (influenced by age)
+    games_played = (rng.exponential(50, num_players) * (age - 17) / 10).astype(np.int16)
+    games_played = np.clip(games_played, 0, 300)
+    
+    # Performance stats (position-dependent): index the parameter tables
+    # by position code and draw every stat for all players in one call
+    params = SAMPLE_NORMAL_TABLE[pos_code]  # (num_players, num_stats, 2)
+    normal_stats = np.ascontiguousarray(rng.normal(params[..., 0], params[..., 1]).T,
+                                        dtype=np.float32)
+    (avg_disposals, avg_marks, avg_tackles, avg_goals,
+     avg_behinds, avg_hitouts) = normal_stats
+    
+    kick_range = SAMPLE_KICK_RATIO_TABLE[pos_code]
+    kick_ratio = rng.uniform(kick_range[:, 0], kick_range[:, 1]).astype(np.float32)
+    avg_kicks = avg_disposals * kick_ratio
+    avg_handballs = avg_disposals - avg_kicks
+    
+    # Ensure non-negative values
+    for stat in (avg_disposals, avg_kicks, avg_handballs, avg_marks,
+                 avg_tackles, avg_goals, avg_hitouts, avg_behinds):
+        np.clip(stat, 0, None, out=stat)
+    
+    # Calculate average score (Supercoach scoring) as one dot product;
+    # free kicks are not simulated so their columns stay zero
+    stats = np.zeros((num_players, len(config.STAT_ORDER)), dtype=np.float32)
+    for stat, values in (('kicks', avg_kicks), ('handballs', avg_handballs),
+                         ('marks', avg_marks), ('tackles', avg_tackles),
+                         ('goals', avg_goals), ('behinds', avg_behinds),
+                         ('hitouts', avg_hitouts)):
+        stats[:, config.STAT_ORDER.index(stat)] = values
+    avg_score = stats @ config.SCORING_WEIGHTS_VEC
+    
+    # Price based on average score and some noise
+    base_price = avg_score * 6000 + rng.normal(50000, 30000, num_players)
+    price = np.clip(base_price, 100000, 800000).astype(np.int32)
+    
+    # Additional features
+    injured_last_year = (rng.random(num_players) < 0.15).astype(np.int8)  # 15% injury rate
+    injury_history = rng.exponential(1, num_players).astype(np.int8) + injured_last_year * 2
+    games_last_3 = np.where(
+        injured_last_year == 1, 0,
+        np.minimum(3, rng.uniform(0, 4, num_players).astype(np.int8))
+    ).astype(np.int8)
+    form_last_5 = (avg_score * rng.uniform(0.8, 1.2, num_players)).astype(np.float32)
+    
+    # Draft pick estimation (better players likely earlier picks)
+    draft_low = np.select([avg_score > 100, avg_score > 80, avg_score > 60], [1, 10, 20], default=30)
+    draft_high = np.select([avg_score > 100, avg_score > 80, avg_score > 60], [20, 40, 60], default=100)
+    draft_pick = rng.uniform(draft_low, draft_high).astype(np.int16)
+    
+    draft_value = (np.maximum(0, 100 - draft_pick) / 100).astype(np.float32)
+    potential = AFLDataCollector.calculate_potential_vec(age).astype(np.float32)
+    
+    # Names are gathered from two index draws and joined in one vectorized concat
+    surnames = np.array(["Smith", "Jones", "Brown", "Wilson", "Taylor", "Johnson", "Williams", "Davis", "Miller", "Anderson"])
+    first_names = np.array(["Jack", "Tom", "Sam", "Luke", "Matt", "Josh", "Ben", "Dan", "Jake", "Alex"])
+    surname_idx = rng.integers(0, len(surnames), num_players)
+    first_name_idx = rng.integers(0, len(first_names), num_players)
+    names = np.char.add(np.char.add(surnames[surname_idx], ' '), first_names[first_name_idx])
+    player_ids = np.char.add('P', np.char.zfill(np.arange(num_players).astype(str), 4))
+    
+    # Round the float stat columns to 2 decimal places in place
+    for values in (avg_disposals, avg_kicks, avg_handballs, avg_marks, avg_tackles,
+                   avg_goals, avg_behinds, avg_hitouts, avg_score, form_last_5):
+        np.round(values, 2, out=values)
+    
+    players = pd.DataFrame({
+        'player_id': player_ids,
+        'name': names,
+        'team': team,
+        'position': position,
+        'age': age,
+        'games_played': games_played,
+        'avg_disposals': avg_disposals,
+        'avg_kicks': avg_kicks,
+        'avg_handballs': avg_handballs,
+        'avg_marks': avg_marks,
+        'avg_tackles': avg_tackles,
+        'avg_goals': avg_goals,
+        'avg_behinds': avg_behinds,
+        'avg_hitouts': avg_hitouts,
+        'avg_score': avg_score,
+        'price': price,
+        'potential': potential,
+        'draft_pick': draft_pick,
+        'draft_value': draft_value,
+        'injured_last_year': injured_last_year,
+        'injury_history': injury_history,
+        'games_last_3': games_last_3,
+        'form_last_5': form_last_5
+    }, copy=False)
+    players['position'] = pd.Categorical(players['position'], categories=POSITIONS)
+    players['team'] = players['team'].astype('category')
+    return players
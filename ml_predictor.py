@@ -1,15 +1,81 @@
 """
 Machine Learning models for player performance prediction
 """
+import os
+
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+from threadpoolctl import threadpool_limits
 import joblib
 import config
 
+__all__ = ['PlayerPerformancePredictor']
+
+
+# Model features, in training column order. Age and draft-pick buckets
+# (age_squared, years_to_peak, is_rookie/young/prime/veteran, top-10/first-round/
+# top-5 pick flags) are left out: they are monotone functions of age and
+# draft_pick, which the trees split on directly, and dropping them did not
+# change cross-validated R2
+FEATURE_COLUMNS = [
+    # Age and development features
+    'age', 'potential',
+    
+    # Experience features
+    'games_played', 'experience_level', 'games_per_year',
+    
+    # Draft pedigree (critical for rookie evaluation)
+    'draft_pick', 'draft_value',
+    
+    # Performance features
+    'avg_disposals', 'avg_kicks', 'avg_handballs',
+    'avg_marks', 'avg_tackles', 'avg_goals', 'avg_behinds', 'avg_hitouts',
+    
+    # Team and position
+    'team_encoded', 'position_encoded',
+    
+    # Health and availability
+    'injured_last_year', 'injury_history', 'injury_risk',
+    'games_last_3', 'availability_score',
+    
+    # Form and value
+    'form_last_5', 'price_per_point', 'form_ratio',
+    
+    # Potential and development (key for rookies)
+    'potential_adjusted_score', 'rookie_upside', 'growth_potential',
+    'projected_improvement', 'future_score_projection'
+]
+
+# Features taken unchanged from the player data
+PASSTHROUGH_FEATURES = [
+    'age', 'potential', 'games_played', 'draft_pick', 'draft_value',
+    'avg_disposals', 'avg_kicks', 'avg_handballs', 'avg_marks', 'avg_tackles',
+    'avg_goals', 'avg_behinds', 'avg_hitouts',
+    'injured_last_year', 'injury_history', 'games_last_3', 'form_last_5',
+]
+
+# Columns added by calculate_value_scores, in order
+VALUE_SCORE_COLUMNS = [
+    'predicted_score', 'value_score', 'risk_factor', 'upside_factor',
+    'adjusted_value', 'overall_rank_score',
+]
+
+# Batches smaller than this are predicted single-threaded: for a roster of a
+# few hundred players, starting OpenMP threads costs more than the tree walk
+SINGLE_THREAD_PREDICT_ROWS = 50000
+
+# OpenMP threads used while training: rosters are a few hundred rows, too
+# small to keep many threads busy. Applied only around fit, so other
+# libraries in the process keep their own thread settings
+TRAIN_THREADS = min(4, os.cpu_count() or 1)
+
+# Features computed by prepare_features (returned as extra columns of its frame)
+DERIVED_FEATURES = [col for col in FEATURE_COLUMNS if col not in PASSTHROUGH_FEATURES]
+
 
 class PlayerPerformancePredictor:
     """Predicts player performance using ML models"""
@@ -20,102 +86,153 @@ class PlayerPerformancePredictor:
         self.team_encoder = LabelEncoder()
         self.position_encoder = LabelEncoder()
         self.is_trained = False
-        
+        # Features of the last frame featurized with the fitted encoders, as
+        # (df, X, derived). Matched by identity, so a frame modified in place
+        # must be passed as a new object; reset whenever the encoders are
+        # refitted (train_score_predictor) or replaced (load_model)
+        self._feature_cache = None
+        
+    def _encode(self, encoder, values, fit):
+        """
+        Label-encode values, refitting the encoder when fit is True
+        
+        Otherwise codes are looked up against the fitted classes in one
+        vectorized pass; labels unseen in training are encoded as -1.
+        Categorical columns (as loaded by AFLDataCollector) skip the string
+        sort: their categories become the encoder classes and their codes are
+        used as-is whenever the categories match the fitted classes.
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            categories = values.cat.categories
+            if fit:
+                encoder.classes_ = np.asarray(categories, dtype=object)
+                return values.cat.codes.to_numpy(dtype=np.int32)
+            if categories.equals(pd.Index(encoder.classes_)):
+                return values.cat.codes.to_numpy(dtype=np.int32)
+        elif fit:
+            return encoder.fit_transform(values)
+        return pd.Index(encoder.classes_).get_indexer(values).astype(np.int32)
+    
     def prepare_features(self, df):
-        """Prepare features for ML model with enhanced rookie development modeling"""
-        df = df.copy()
-        
-        # Encode categorical variables
-        df['team_encoded'] = self.team_encoder.fit_transform(df['team'])
-        df['position_encoded'] = self.position_encoder.fit_transform(df['position'])
-        
-        # Calculate value metrics
-        df['price_per_point'] = df['price'] / (df['avg_score'] + 1)
-        df['form_ratio'] = df['form_last_5'] / (df['avg_score'] + 1)
-        
-        # Enhanced age-based features for rookie development
-        df['age_squared'] = df['age'] ** 2  # Capture non-linear age effects
-        df['years_to_peak'] = np.abs(df['age'] - 26)  # Distance from peak age
+        """
+        Prepare features for ML model with enhanced rookie development modeling
+        
+        Returns (X, features_df): X is the read-only float32 matrix the model
+        takes (columns in FEATURE_COLUMNS order), features_df is df with the
+        DERIVED_FEATURES appended as columns (a new frame built with one
+        df.assign; df itself is not modified).
+        """
+        X, derived = self._features(df)
+        # The frame gets its own copies of the derived columns: without
+        # copy-on-write, pandas 2 would share the cached arrays with it
+        return X, df.assign(**{col: values.copy() for col, values in derived.items()})
+    
+    def _features(self, df, fit=False):
+        """
+        Feature matrix and derived feature arrays of df (see prepare_features)
+        
+        Derived features are computed from the input columns as NumPy arrays
+        and written straight into a float32 feature matrix; the input
+        DataFrame is neither copied nor modified. Training and prediction
+        only need the matrix, so they call this directly.
+        
+        fit=True refits the team/position encoders on df (every training
+        run does); before the first training they are always fitted.
+        
+        The result for the last frame is kept (see _feature_cache), so
+        prepare_features and predictions on the same frame featurize it once.
+        """
+        cached = self._feature_cache
+        if not fit and cached is not None and cached[0] is df:
+            return cached[1:]
+        
+        age = df['age'].to_numpy(dtype=np.float64)
+        avg_score = df['avg_score'].to_numpy(dtype=np.float64)
+        draft_value = df['draft_value'].to_numpy(dtype=np.float64)
+        games_played = df['games_played'].to_numpy(dtype=np.float64)
+        injured_last_year = df['injured_last_year'].to_numpy(dtype=np.float64)
+        
+        features = {col: df[col].to_numpy() for col in PASSTHROUGH_FEATURES}
+        
+        # Encode categorical variables: the encoders are fitted when training
+        # and reused afterwards so codes match the trained model
+        fit = fit or not self.is_trained
+        features['team_encoded'] = self._encode(self.team_encoder, df['team'], fit)
+        features['position_encoded'] = self._encode(self.position_encoder, df['position'], fit)
+        
+        # Calculate value metrics (shared denominator; in-place ops below avoid
+        # allocating temporaries)
+        score_denom = avg_score + 1
+        price_per_point = df['price'].to_numpy(dtype=np.float64, copy=True)
+        price_per_point /= score_denom
+        form_ratio = df['form_last_5'].to_numpy(dtype=np.float64, copy=True)
+        form_ratio /= score_denom
+        features['price_per_point'] = price_per_point
+        features['form_ratio'] = form_ratio
         
         # Rookie and young player identification (key for development modeling)
-        df['is_rookie'] = (df['age'] <= 20).astype(int)  # Young players in early career (typically 1st-2nd year)
-        df['is_young_developing'] = ((df['age'] > 20) & (df['age'] <= 23)).astype(int)  # Development years
-        df['is_prime_age'] = ((df['age'] >= 24) & (df['age'] <= 28)).astype(int)  # Peak performance
-        df['is_veteran'] = (df['age'] > 28).astype(int)  # Experienced players
+        is_rookie = (age <= 20).astype(int)  # Young players in early career (typically 1st-2nd year)
+        is_young_developing = ((age > 20) & (age <= 23)).astype(int)  # Development years
         
         # Games experience features (important for rookie trajectory)
-        df['experience_level'] = np.log1p(df['games_played'])  # Log transform for diminishing returns
-        df['games_per_year'] = df['games_played'] / np.maximum(df['age'] - 17, 1)  # Availability rate
-        
-        # Draft pick features (lower draft pick = better, critical for rookies)
-        df['is_top_10_pick'] = (df['draft_pick'] <= 10).astype(int)
-        df['is_first_round_pick'] = (df['draft_pick'] <= 20).astype(int)
-        df['elite_draft_pedigree'] = (df['draft_pick'] <= 5).astype(int)  # Top 5 picks - elite talent
+        features['experience_level'] = np.log1p(games_played)  # Log transform for diminishing returns
+        years_playing = age - 17
+        np.maximum(years_playing, 1, out=years_playing)
+        features['games_per_year'] = np.divide(games_played, years_playing, out=years_playing)  # Availability rate
         
         # Rookie development trajectory features
         # High draft picks who are young have huge upside
-        df['rookie_upside'] = (
-            df['is_rookie'] * df['draft_value'] * 2 +  # Rookies with good draft position
-            df['is_young_developing'] * df['draft_value'] * 1.5  # Young players still developing
-        )
+        rookie_upside = is_rookie * draft_value
+        rookie_upside *= 2  # Rookies with good draft position
+        young_upside = is_young_developing * draft_value
+        young_upside *= 1.5  # Young players still developing
+        rookie_upside += young_upside
+        features['rookie_upside'] = rookie_upside
         
         # Potential-based projections (critical for rookies getting better)
-        df['potential_adjusted_score'] = df['avg_score'] * df['potential']
-        df['growth_potential'] = np.maximum(0, (23 - df['age']) / 5) * df['draft_value']  # Years of growth left
+        features['potential_adjusted_score'] = avg_score * df['potential'].to_numpy(dtype=np.float64)
+        growth_potential = 23 - age
+        growth_potential /= 5
+        np.maximum(growth_potential, 0, out=growth_potential)
+        growth_potential *= draft_value
+        features['growth_potential'] = growth_potential  # Years of growth left
         
         # For rookies/young players with limited games, boost score by potential
-        df['projected_improvement'] = 0.0
-        # Rookies (age <= 20) with top draft picks expected to improve significantly
-        df.loc[df['is_rookie'] == 1, 'projected_improvement'] = df['draft_value'] * 15  # Up to 15 point improvement
-        # Young developing players (21-23) still improving
-        df.loc[df['is_young_developing'] == 1, 'projected_improvement'] = df['draft_value'] * 8  # Up to 8 point improvement
+        # Rookies (age <= 20) with top draft picks expected to improve significantly (up to 15 points)
+        # Young developing players (21-23) still improving (up to 8 points)
+        projected_improvement = np.select(
+            [is_young_developing == 1, is_rookie == 1], [draft_value * 8, draft_value * 15], default=0.0
+        )
+        features['projected_improvement'] = projected_improvement
         
         # Combine current performance with projected improvement
-        df['future_score_projection'] = df['avg_score'] + df['projected_improvement']
+        features['future_score_projection'] = avg_score + projected_improvement
         
         # Injury impact (but less penalty for young players with no history)
-        df['injury_risk'] = df['injury_history'] + df['injured_last_year'] * 2
-        df['availability_score'] = df['games_last_3'] / 3.0  # 0-1 scale
-        
-        # Select features for model
-        feature_cols = [
-            # Age and development features
-            'age', 'age_squared', 'years_to_peak', 'potential',
-            'is_rookie', 'is_young_developing', 'is_prime_age', 'is_veteran',
-            
-            # Experience features
-            'games_played', 'experience_level', 'games_per_year',
-            
-            # Draft pedigree (critical for rookie evaluation)
-            'draft_pick', 'draft_value', 'is_top_10_pick', 'is_first_round_pick', 'elite_draft_pedigree',
-            
-            # Performance features
-            'avg_disposals', 'avg_kicks', 'avg_handballs',
-            'avg_marks', 'avg_tackles', 'avg_goals', 'avg_behinds', 'avg_hitouts',
-            
-            # Team and position
-            'team_encoded', 'position_encoded',
-            
-            # Health and availability
-            'injured_last_year', 'injury_history', 'injury_risk',
-            'games_last_3', 'availability_score',
-            
-            # Form and value
-            'form_last_5', 'price_per_point', 'form_ratio',
-            
-            # Potential and development (key for rookies)
-            'potential_adjusted_score', 'rookie_upside', 'growth_potential',
-            'projected_improvement', 'future_score_projection'
-        ]
-        
-        X = df[feature_cols]
-        return X, df
+        injury_risk = injured_last_year * 2
+        injury_risk += df['injury_history'].to_numpy(dtype=np.float64)
+        features['injury_risk'] = injury_risk
+        features['availability_score'] = df['games_last_3'].to_numpy(dtype=np.float64) / 3.0  # 0-1 scale
+        
+        # The trees compare float32 thresholds, so the matrix is built as
+        # C-contiguous float32 up front and sklearn does not convert it again
+        X = np.empty((len(df), len(FEATURE_COLUMNS)), dtype=np.float32)
+        for i, col in enumerate(FEATURE_COLUMNS):
+            X[:, i] = features[col]
+        X.setflags(write=False)
+        derived = {col: features[col] for col in DERIVED_FEATURES}
+        
+        # Codes depend on the fitted encoders, so only cache when they were
+        # not refitted
+        if not fit:
+            self._feature_cache = (df, X, derived)
+        return X, derived
     
-    def train_score_predictor(self, df):
-        """Train model to predict player scores"""
+    def train_score_predictor(self, df, cv=False):
+        """Train model to predict player scores (cv: also report cross-validated RMSE)"""
         print("Training score prediction model...")
         
-        X, df = self.prepare_features(df)
+        X, _ = self._features(df, fit=True)
         y = df['avg_score']
         
         # Split data
@@ -124,15 +241,23 @@ class PlayerPerformancePredictor:
             random_state=config.MODEL_CONFIG['random_state']
         )
         
-        # Train ensemble model
-        self.score_model = GradientBoostingRegressor(
-            n_estimators=200,
+        # Train histogram-based gradient boosting model
+        self.score_model = HistGradientBoostingRegressor(
+            max_iter=200,
             max_depth=6,
             learning_rate=0.1,
+            # Stop once 10 rounds fail to improve the held-out loss
+            early_stopping=True,
+            validation_fraction=0.1,
+            n_iter_no_change=10,
+            tol=1e-3,
             random_state=config.MODEL_CONFIG['random_state']
         )
         
-        self.score_model.fit(X_train, y_train)
+        with threadpool_limits(limits=TRAIN_THREADS, user_api='openmp'):
+            self.score_model.fit(X_train, y_train)
+        self.is_trained = True
+        self._feature_cache = None
         
         # Evaluate
         y_pred = self.score_model.predict(X_test)
@@ -145,83 +270,109 @@ class PlayerPerformancePredictor:
         print(f"  MAE: {mae:.2f}")
         print(f"  R2 Score: {r2:.4f}")
         
-        # Cross-validation
-        cv_scores = cross_val_score(
-            self.score_model, X, y, cv=config.MODEL_CONFIG['cv_folds'],
-            scoring='neg_mean_squared_error'
-        )
-        print(f"  CV RMSE: {np.sqrt(-cv_scores.mean()):.2f} (+/- {np.sqrt(cv_scores.std()):.2f})")
+        # Cross-validation (diagnostic only: refits the model once per fold)
+        if cv:
+            cv_scores = cross_val_score(
+                self.score_model, X, y, cv=config.MODEL_CONFIG['cv_folds'],
+                scoring='neg_mean_squared_error', n_jobs=-1
+            )
+            print(f"  CV RMSE: {np.sqrt(-cv_scores.mean()):.2f} (+/- {np.sqrt(cv_scores.std()):.2f})")
         
         return self.score_model
     
-    def predict_scores(self, df):
-        """Predict scores for players"""
+    def predict_scores(self, df, X=None):
+        """Predict scores for players (X: features already built by prepare_features)"""
         if self.score_model is None:
             raise ValueError("Model not trained. Call train_score_predictor() first.")
         
-        X, _ = self.prepare_features(df)
+        if X is None:
+            X, _ = self._features(df)
+        if len(X) < SINGLE_THREAD_PREDICT_ROWS:
+            with threadpool_limits(limits=1, user_api='openmp'):
+                return self.score_model.predict(X)
         predictions = self.score_model.predict(X)
         return predictions
     
-    def calculate_value_scores(self, df):
-        """Calculate value scores with enhanced rookie development modeling"""
-        df = df.copy()
+    def calculate_value_scores(self, df, X=None):
+        """
+        Calculate value scores with enhanced rookie development modeling
+        
+        The derived columns are collected as arrays and appended with a
+        single df.assign, which returns a new frame and leaves df unchanged.
+        Under pandas copy-on-write (the pandas 3 default) the player columns
+        are shared rather than copied; older pandas copies them once.
+        """
+        # Nothing to score: return the (empty) columns without calling the model
+        if len(df) == 0:
+            return df.assign(**dict.fromkeys(VALUE_SCORE_COLUMNS, np.empty(0)))
         
         # Predict expected scores (includes rookie improvement projections)
-        predicted_scores = self.predict_scores(df)
-        df['predicted_score'] = predicted_scores
+        predicted_scores = self.predict_scores(df, X=X)
+        derived = {'predicted_score': predicted_scores}
         
         # Calculate base value (points per $100k)
-        df['value_score'] = (df['predicted_score'] / df['price']) * 100000
+        value_score = predicted_scores / df['price'].to_numpy(dtype=np.float64)
+        value_score *= 100000
+        derived['value_score'] = value_score
         
-        # Risk adjustment based on injury history and availability
-        df['risk_factor'] = 1 - (df['injury_history'] * 0.1)
-        df['risk_factor'] = df['risk_factor'].clip(0.5, 1.0)
+        age = df['age'].to_numpy(dtype=np.float64)
+        potential = df['potential'].to_numpy(dtype=np.float64)
+        draft_value = df['draft_value'].to_numpy(dtype=np.float64)
         
-        # Additional penalty for injured last year
-        df.loc[df['injured_last_year'] == 1, 'risk_factor'] *= 0.9
+        # Risk adjustment based on injury history and availability,
+        # with an additional penalty for injured last year
+        risk_factor = np.clip(1 - df['injury_history'].to_numpy(dtype=np.float64) * 0.1, 0.5, 1.0)
+        risk_factor *= np.where(df['injured_last_year'].to_numpy() == 1, 0.9, 1.0)
+        derived['risk_factor'] = risk_factor
         
         # Enhanced upside factor for rookies and young players getting better
-        df['upside_factor'] = 1.0
-        
+        rookie = age <= 20
+        young = (age > 20) & (age <= 23)
         # Rookies (age <= 20): Massive upside if high draft picks
-        rookie_mask = df['age'] <= 20
-        df.loc[rookie_mask, 'upside_factor'] = (
-            1.0 + (df.loc[rookie_mask, 'potential'] - 1.0) * 1.5 +  # Potential boost
-            df.loc[rookie_mask, 'draft_value'] * 0.3  # Draft pedigree boost
-        )
-        
+        #   1.0 + (potential - 1.0) * 1.5 + draft_value * 0.3
         # Young developing players (21-23): Strong upside
-        young_mask = (df['age'] > 20) & (df['age'] <= 23)
-        df.loc[young_mask, 'upside_factor'] = (
-            1.0 + (df.loc[young_mask, 'potential'] - 1.0) * 1.2 +  # Potential boost
-            df.loc[young_mask, 'draft_value'] * 0.2  # Draft pedigree boost
-        )
+        #   1.0 + (potential - 1.0) * 1.2 + draft_value * 0.2
+        # Everyone else: 1.0 (both weights are zero)
+        # Evaluated once for all rows with per-row weights, in place
+        potential_weight = np.select([rookie, young], [1.5, 1.2], default=0.0)
+        draft_weight = np.select([rookie, young], [0.3, 0.2], default=0.0)
+        upside_factor = potential - 1.0
+        upside_factor *= potential_weight
+        upside_factor += 1.0
+        draft_weight *= draft_value
+        upside_factor += draft_weight
         
         # Elite draft picks (top 5) get extra boost - they're future stars
-        elite_draft_mask = df['draft_pick'] <= 5
-        df.loc[elite_draft_mask & (df['age'] <= 23), 'upside_factor'] *= 1.15
+        elite_draft = (df['draft_pick'].to_numpy() <= 5) & (age <= 23)
         
         # Breakout potential: Young players with limited games but good stats
-        breakout_potential_mask = (
-            (df['age'] <= 23) & 
-            (df['games_played'] < 44) &  # Less than 2 full seasons
-            (df['avg_score'] > 60)  # Already showing promise
+        breakout_potential = (
+            (age <= 23) &
+            (df['games_played'].to_numpy() < 44) &  # Less than 2 full seasons
+            (df['avg_score'].to_numpy() > 60)  # Already showing promise
         )
-        df.loc[breakout_potential_mask, 'upside_factor'] *= 1.1
+        upside_factor *= np.where(elite_draft, 1.15, 1.0) * np.where(breakout_potential, 1.1, 1.0)
+        derived['upside_factor'] = upside_factor
         
         # Adjusted value score with risk and upside
         # For overall rank, we prioritize total score, so upside matters more
-        df['adjusted_value'] = df['value_score'] * df['risk_factor'] * df['upside_factor']
+        risk_upside = risk_factor * upside_factor
+        derived['adjusted_value'] = value_score * risk_upside
         
         # For overall rank optimization: Create score-focused metric
         # This prioritizes predicted score with rookie upside
-        df['overall_rank_score'] = df['predicted_score'] * df['upside_factor'] * df['risk_factor']
+        derived['overall_rank_score'] = predicted_scores * risk_upside
         
-        return df
+        return df.assign(**derived)
     
     def save_model(self, filepath='model.pkl'):
-        """Save trained model"""
+        """
+        Save trained model
+        
+        The file is written uncompressed so load_model can memory-map the
+        tree arrays; keep it on a local filesystem (not NFS) so processes
+        loading it share the page cache.
+        """
         if self.score_model is None:
             raise ValueError("No model to save")
         
@@ -230,14 +381,15 @@ class PlayerPerformancePredictor:
             'team_encoder': self.team_encoder,
             'position_encoder': self.position_encoder
         }
-        joblib.dump(model_data, filepath)
+        joblib.dump(model_data, filepath, compress=0)
         print(f"Model saved to {filepath}")
     
     def load_model(self, filepath='model.pkl'):
-        """Load trained model"""
-        model_data = joblib.load(filepath)
+        """Load trained model (arrays are memory-mapped read-only, shared between processes)"""
+        model_data = joblib.load(filepath, mmap_mode='r')
         self.score_model = model_data['score_model']
         self.team_encoder = model_data['team_encoder']
         self.position_encoder = model_data['position_encoder']
         self.is_trained = True
+        self._feature_cache = None
         print(f"Model loaded from {filepath}")
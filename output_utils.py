@@ -0,0 +1,20 @@
+"""
+Console output helpers shared by the team optimizers
+"""
+import contextlib
+import functools
+import io
+import sys
+
+
+def buffered_output(method):
+    """Collect a report method's printout and write it to stdout in one call"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        buffer = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buffer):
+                return method(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+    return wrapper
@@ -2,7 +2,6 @@
 Main program for AFL Supercoach 2026 Team Optimizer
 """
 import sys
-import pandas as pd
 from data_collector import AFLDataCollector
 from ml_predictor import PlayerPerformancePredictor
 from team_optimizer import TeamOptimizer
@@ -44,7 +43,7 @@ def main():
     print("STEP 2: Training Machine Learning Models")
     print("-" * 40)
     predictor = PlayerPerformancePredictor()
-    predictor.train_score_predictor(players_df)
+    predictor.train_score_predictor(players_df, cv=False)
     
     # Save model
     predictor.save_model('supercoach_model.pkl')
@@ -57,14 +56,18 @@ def main():
     
     # Display top players by position
     print("\nTop 5 Players by Value Score (per position):")
-    for position in ['DEF', 'MID', 'RUC', 'FWD']:
+    # One stable sort and a per-position head (ties keep data order, as with nlargest)
+    ranked = players_df.sort_values('adjusted_value', ascending=False, kind='stable')
+    top_by_position = ranked.groupby('position', observed=True).head(5)
+    for position in config.POS_ORDER:
         print(f"\n{position}:")
-        top_players = players_df[players_df['position'] == position].nlargest(5, 'adjusted_value')
-        for _, player in top_players.iterrows():
-            print(f"  {player['name']:25s} - "
-                  f"Score: {player['predicted_score']:6.2f} - "
-                  f"Price: ${player['price']:7,} - "
-                  f"Value: {player['adjusted_value']:5.2f}")
+        top_players = top_by_position[top_by_position['position'] == position]
+        top_rows = top_players[['name', 'predicted_score', 'price', 'adjusted_value']].itertuples(index=False, name=None)
+        for name, score, price, value in top_rows:
+            print(f"  {name:25s} - "
+                  f"Score: {score:6.2f} - "
+                  f"Price: ${price:7,} - "
+                  f"Value: {value:5.2f}")
     
     # Step 4: Optimize team selection for maximum score (overall rank victory)
     print("\n" + "="*80)
@@ -73,8 +76,20 @@ def main():
     print("Strategy: Maximize predicted weekly score to win overall rank")
     optimizer = TeamOptimizer()
     
-    # Use max_score strategy to win overall rank
-    team = optimizer.optimize_team(players_df, strategy='max_score')
+    # Use max_score strategy to win overall rank. The exact ILP finds the best
+    # legal squad; the greedy heuristic is the fallback when it finds none
+    try:
+        team = optimizer.optimize_team_ilp(players_df, strategy='max_score')
+    except ValueError as e:
+        print(f"\n⚠ ILP selection failed: {e}")
+        print("Falling back to greedy selection")
+        try:
+            team = optimizer.optimize_team(players_df, strategy='max_score')
+        except ValueError as err:
+            # Even the cheapest legal starting 22 is over the cap
+            print(f"\n❌ ERROR: Could not select a team: {err}")
+            print("Check the player prices and config.SALARY_CAP.")
+            sys.exit(1)
     
     # Step 5: Display and save results
     print("\n" + "="*80)
@@ -89,7 +104,9 @@ def main():
     # Save team to Excel
     optimizer.save_team_excel('optimal_team_2026.xlsx')
     
-    # Save detailed analysis
+    # Save detailed analysis: Parquet for fast re-reads in analysis scripts,
+    # CSV for the committed, human-readable copy
+    players_df.to_parquet('all_players_analyzed.parquet', index=False, compression='zstd')
     players_df.to_csv('all_players_analyzed.csv', index=False)
     
     print("\n" + "="*80)
@@ -99,6 +116,7 @@ def main():
     print("  - optimal_team_2026.xlsx: Your optimized team (Excel)")
     print("  - optimal_team_2026.csv: Your optimized team (CSV)")
     print("  - all_players_analyzed.csv: All players with predictions")
+    print("  - all_players_analyzed.parquet: All players with predictions (Parquet)")
     print("  - player_data_2026.csv: Raw player data")
     print("  - supercoach_model.pkl: Trained ML model")
     print("\nUse this team to dominate Supercoach 2026!")
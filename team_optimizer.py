@@ -1,9 +1,144 @@
 """
 Team optimization - Simplified greedy approach with guaranteed position filling
 """
+import contextlib
+import importlib.util
+import io
+
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 import config
+from output_utils import buffered_output
+
+# xlsxwriter writes the Excel report several times faster than openpyxl;
+# openpyxl remains the fallback when it is not installed. Only probed here:
+# pandas imports the engine when the report is written
+EXCEL_ENGINE = 'xlsxwriter' if importlib.util.find_spec('xlsxwriter') else 'openpyxl'
+
+__all__ = ['TeamOptimizer', 'InfeasibleSquadError', 'optimize_portfolio']
+
+# Columns added by PlayerPerformancePredictor.calculate_value_scores; the
+# optimizer only reads these and never predicts itself
+SCORED_COLUMNS = ('predicted_score', 'adjusted_value', 'overall_rank_score')
+
+# Weight of bench players' objective in the ILP: the starting 22 is what
+# scores, the bench term only breaks ties between equally good lineups
+ILP_BENCH_WEIGHT = 0.01
+
+# Score-derived columns rescaled together when simulating prediction error
+# (all three are proportional to predicted_score). The same columns
+# _check_scored requires, so the two cannot drift apart
+SIMULATED_COLUMNS = SCORED_COLUMNS
+
+# Columns shown per player by display_team, in print order, and the line
+# they are formatted into
+DISPLAY_COLUMNS = ['name', 'team', 'price', 'predicted_score', 'adjusted_value']
+DISPLAY_LINE = "  {:25s} ({:15s}) - ${:7,} - Score: {:6.2f} - Value: {:5.2f}"
+
+
+class InfeasibleSquadError(ValueError):
+    """No legal squad fits under the salary cap"""
+
+
+def _greedy_bench(candidates, prices, pos_codes, budget, position_counts, max_per_pos, needed):
+    """
+    Pick up to `needed` bench players from candidate rows, in the given order
+    
+    A candidate is taken if it is affordable and its position (code into
+    config.POS_ORDER) is below the position maximum. Updates the
+    position_counts array in place and returns (picked rows, remaining budget).
+    """
+    # If the first `needed` candidates all fit (cumulative cost within the
+    # budget, no position over its maximum), none would be skipped: take
+    # them in one step
+    first = np.asarray(candidates[:needed])
+    if 0 < len(first) == needed:
+        first_codes = pos_codes[first]
+        if first_codes.min() >= 0:
+            counts = position_counts + np.bincount(first_codes, minlength=len(position_counts))
+            cost = prices[first].sum()
+            if cost <= budget and (counts <= max_per_pos).all():
+                position_counts[:] = counts
+                return first.tolist(), budget - cost
+
+    picked = []
+    for i in candidates:
+        if len(picked) >= needed:
+            break
+        code = pos_codes[i]
+        price = prices[i]
+        # Check if we can add more of this position and afford it
+        if code >= 0 and price <= budget and position_counts[code] < max_per_pos[code]:
+            picked.append(i)
+            budget -= price
+            position_counts[code] += 1
+    return picked, budget
+
+
+def _display_lines_by_position(players):
+    """Players' DISPLAY_LINE text grouped by position (one string each, in team order)"""
+    grouped = players.groupby('position', sort=False)[DISPLAY_COLUMNS]
+    return {
+        pos: "\n".join(DISPLAY_LINE.format(*row) for row in group.itertuples(index=False, name=None))
+        for pos, group in grouped
+    }
+
+
+def _check_scored(players_df):
+    """Raise ValueError unless players_df has the SCORED_COLUMNS"""
+    missing = [col for col in SCORED_COLUMNS if col not in players_df.columns]
+    if missing:
+        raise ValueError(f"Players are not scored (missing {missing}). "
+                         "Call calculate_value_scores() first.")
+
+
+def _single_run(players_df, strategy, seed, score_noise):
+    """
+    Run the greedy selection on one simulated draw of the predicted scores
+    
+    Each player's score columns are scaled by a common factor
+    N(1, score_noise), drawn from `seed`; seed=None uses the scores as-is.
+    Runs a fresh TeamOptimizer with its printout suppressed and returns
+    None when no squad fits under the salary cap (InfeasibleSquadError);
+    any other error propagates.
+    """
+    if seed is not None:
+        rng = np.random.default_rng(seed)
+        factor = np.clip(rng.normal(1.0, score_noise, len(players_df)), 0, None)
+        players_df = players_df.assign(
+            **{col: players_df[col].to_numpy() * factor for col in SIMULATED_COLUMNS}
+        )
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return TeamOptimizer()._optimize_team(players_df, strategy)
+    except InfeasibleSquadError:
+        return None
+
+
+def optimize_portfolio(players_df, strategies=('max_score', 'balanced', 'value'),
+                       n_sims=100, score_noise=0.1, n_jobs=-1):
+    """
+    Optimize teams for every strategy under n_sims simulated score draws
+    
+    Runs are independent, so they are spread over processes with joblib.
+    Returns {(strategy, seed): selected_team}; n_sims=0 runs each strategy
+    once on the unperturbed scores (seed None). Draws with no squad under
+    the salary cap are counted and left out rather than failing the batch.
+    """
+    _check_scored(players_df)
+    
+    seeds = list(range(n_sims)) if n_sims > 0 else [None]
+    runs = [(strategy, seed) for strategy in strategies for seed in seeds]
+    teams = Parallel(n_jobs=n_jobs, backend='loky')(
+        delayed(_single_run)(players_df, strategy, seed, score_noise) for strategy, seed in runs
+    )
+    
+    portfolio = {run: team for run, team in zip(runs, teams) if team is not None}
+    infeasible = len(runs) - len(portfolio)
+    if infeasible:
+        print(f"⚠ {infeasible} of {len(runs)} runs had no squad under the salary cap (skipped)")
+    return portfolio
 
 
 class TeamOptimizer:
@@ -11,6 +146,12 @@ class TeamOptimizer:
     
     def __init__(self):
         self.selected_team = None
+        # (starting, bench) split of selected_team and the team it was split from
+        self._split = None
+        self._split_from = None
+        # Summary statistics of selected_team and the team they describe
+        self._stats = None
+        self._stats_from = None
         
     def optimize_team(self, players_df, strategy='max_score'):
         """
@@ -23,37 +164,61 @@ class TeamOptimizer:
         - 'max_score': Maximize total predicted score (best for overall rank)
         - 'balanced': Balance between score and value
         - 'value': Maximize value (points per dollar)
+        
+        players_df must already be scored by calculate_value_scores, so the
+        same predictions can be reused across strategies.
         """
+        _check_scored(players_df)
+        return self._optimize_team(players_df, strategy)
+    
+    def _optimize_team(self, players_df, strategy):
+        """Greedy team selection (see optimize_team)"""
         print("\n" + "="*60)
         print("OPTIMIZING TEAM SELECTION - SUPERCOACH 2026 RULES")
         print(f"Strategy: {strategy.upper()} - Maximizing for Overall Rank Victory")
         print("="*60)
         
-        df = players_df.copy()
-        
-        # Set optimization objective based on strategy
+        # Set optimization objective based on strategy (players_df itself is
+        # never copied: only the selected rows are gathered into the team)
         if strategy == 'max_score':
             # For overall rank, use score that includes rookie upside
-            df['objective'] = df['overall_rank_score']  # Predicted score * upside * risk
+            objective = players_df['overall_rank_score']  # Predicted score * upside * risk
             print("\n🎯 Objective: MAXIMIZE SCORE with ROOKIE UPSIDE (Win Overall Rank)")
             print("   Factoring in young players getting better throughout the season")
         elif strategy == 'value':
-            df['objective'] = df['adjusted_value']
+            objective = players_df['adjusted_value']
             print("\n🎯 Objective: Maximize value (points per dollar)")
         else:  # balanced
             # Balanced approach: score * value
-            df['objective'] = df['predicted_score'] * df['adjusted_value']
+            objective = players_df['predicted_score'] * players_df['adjusted_value']
             print("\n🎯 Objective: Balance score and value")
         
-        # Sort by objective
-        df = df.sort_values('objective', ascending=False).reset_index(drop=True)
+        # Sort by objective: `order` maps sorted row i to its players_df row
+        order = objective.reset_index(drop=True).sort_values(ascending=False).index.to_numpy()
+        objective = objective.to_numpy()[order]
+        
+        # Plain arrays for the selection loops (row i of each is sorted row i);
+        # iterating these avoids building a Series per player
+        pos_codes = pd.Categorical(players_df['position'], categories=config.POS_ORDER).codes[order]
+        prices = players_df['price'].to_numpy(dtype=np.int64)[order]
+        scores = players_df['predicted_score'].to_numpy()[order]
         
+        # Row positions per position (objective order) and of all players by
+        # ascending price (ties keep objective order), computed once
+        rows_by_position = {pos: np.flatnonzero(pos_codes == code) for code, pos in enumerate(config.POS_ORDER)}
+        price_order = np.argsort(prices, kind='stable')
+        
+        # Selected players as sorted row positions, with their onfield flags
         selected = []
+        selected_onfield = []
         remaining_budget = config.SALARY_CAP
-        position_counts = {pos: 0 for pos in config.POSITION_REQUIREMENTS.keys()}
+        # Players per position, indexed by position code
+        position_counts = np.zeros(len(config.POS_ORDER), dtype=np.int32)
+        # Position requirements indexed by position code, read once as plain ints
+        min_per_pos, max_per_pos, onfield_per_pos = config.POS_REQ_ARRAY.T.tolist()
         
         # Calculate target budget per position based on requirements
-        total_onfield = sum(config.POSITION_REQUIREMENTS[pos]['on_field'] for pos in ['DEF', 'MID', 'RUC', 'FWD'])
+        total_onfield = sum(onfield_per_pos)
         avg_price_per_player = config.SALARY_CAP / config.TEAM_SIZE
         
         print(f"\nBudget Strategy:")
@@ -61,11 +226,21 @@ class TeamOptimizer:
         print(f"  Target Players: {config.TEAM_SIZE}")
         print(f"  Average Price Target: ${avg_price_per_player:,.0f} per player")
         
+        # Fail fast when even the cheapest starters of every position exceed
+        # the cap: Phase 1 could not fill the starting 22
+        min_onfield_cost = sum(
+            np.sort(prices[rows_by_position[pos]])[:onfield_per_pos[code]].sum()
+            for code, pos in enumerate(config.POS_ORDER)
+        )
+        if min_onfield_cost > config.SALARY_CAP:
+            raise InfeasibleSquadError(f"Salary cap infeasible: min feasible cost = ${min_onfield_cost:,} "
+                                       f"(cap ${config.SALARY_CAP:,})")
+        
         # Phase 1: Fill onfield positions prioritizing high scorers
         print("\nPhase 1: Selecting starting 22 onfield players (highest scorers)...")
-        for pos in ['DEF', 'MID', 'RUC', 'FWD']:
-            onfield_needed = config.POSITION_REQUIREMENTS[pos]['on_field']
-            pos_players = df[df['position'] == pos].copy()
+        for code, pos in enumerate(config.POS_ORDER):
+            onfield_needed = onfield_per_pos[code]
+            pos_rows = rows_by_position[pos]  # In objective order
             
             # Calculate budget for this position (more flexible for max_score strategy)
             if strategy == 'max_score':
@@ -80,26 +255,46 @@ class TeamOptimizer:
             
             # Pre-calculate position score threshold for max_score strategy
             if strategy == 'max_score':
-                pos_score_threshold = df[df['position'] == pos]['predicted_score'].quantile(0.6)
+                pos_score_threshold = pd.Series(scores[pos_rows]).quantile(0.6)
             
-            # Select best players by objective
+            # Until the last slots (2 for max_score, 1 otherwise) only players
+            # meeting the strategy criterion are taken. If the first such
+            # players together fit the budget, none is skipped for price, so
+            # they are taken in one cumulative-cost step
+            must_fill_from = max(onfield_needed - (2 if strategy == 'max_score' else 1), 0)
+            pos_prices = prices[pos_rows]
+            if strategy == 'max_score':
+                meets_criterion = scores[pos_rows] >= pos_score_threshold
+            else:
+                meets_criterion = pos_prices <= target_price * 1.5
+            first_picks = np.flatnonzero(meets_criterion)[:must_fill_from]
+            start = 0
             selected_for_pos = 0
-            for _, player in pos_players.iterrows():
-                if selected_for_pos < onfield_needed and player['price'] <= remaining_budget:
+            if 0 < len(first_picks) == must_fill_from and pos_prices[first_picks].sum() <= remaining_budget:
+                selected.extend(pos_rows[first_picks])
+                selected_onfield.extend([True] * must_fill_from)
+                remaining_budget -= pos_prices[first_picks].sum()
+                position_counts[code] += must_fill_from
+                selected_for_pos = must_fill_from
+                start = first_picks[-1] + 1
+            
+            # Select best players by objective (the remaining slots)
+            for i in pos_rows[start:]:
+                price = prices[i]
+                if selected_for_pos < onfield_needed and price <= remaining_budget:
                     # For max_score, be more aggressive with high scorers
                     if strategy == 'max_score':
-                        accept = (player['predicted_score'] >= pos_score_threshold or
+                        accept = (scores[i] >= pos_score_threshold or
                                  selected_for_pos >= onfield_needed - 2)  # Must fill last 2 slots
                     else:
-                        accept = ((player['price'] <= target_price * 1.5) or 
+                        accept = ((price <= target_price * 1.5) or 
                                  (selected_for_pos >= onfield_needed - 1))
                     
                     if accept or selected_for_pos >= onfield_needed - 1:  # Must fill last slots
-                        player_dict = player.to_dict()
-                        player_dict['onfield'] = True
-                        selected.append(player_dict)
-                        remaining_budget -= player['price']
-                        position_counts[pos] += 1
+                        selected.append(i)
+                        selected_onfield.append(True)
+                        remaining_budget -= price
+                        position_counts[code] += 1
                         selected_for_pos += 1
                         
                 if selected_for_pos >= onfield_needed:
@@ -107,68 +302,28 @@ class TeamOptimizer:
         
         # Phase 2: Fill bench (8 players) - cheaper backup options
         print(f"\nPhase 2: Selecting {config.BENCH_SIZE} bench players...")
-        selected_ids = [s['player_id'] for s in selected]
-        remaining_players = df[~df['player_id'].isin(selected_ids)].copy()
+        available = np.ones(len(order), dtype=bool)
+        available[selected] = False
         
         # For bench, prioritize cheap players with decent scores
-        remaining_players = remaining_players.sort_values('price', ascending=True)
+        bench_rows = price_order[available[price_order]]  # Unselected players, cheapest first
         
         target_bench_price = remaining_budget / config.BENCH_SIZE if remaining_budget > 0 else 100000
         print(f"  Target bench price: ~${target_bench_price:,.0f} each (cheapest available)")
         
-        bench_count = 0
-        for _, player in remaining_players.iterrows():
-            pos = player['position']
-            # Check if we can add more of this position and afford it
-            if (bench_count < config.BENCH_SIZE and 
-                player['price'] <= remaining_budget and
-                position_counts[pos] < config.POSITION_REQUIREMENTS[pos]['max']):
-                player_dict = player.to_dict()
-                player_dict['onfield'] = False
-                selected.append(player_dict)
-                remaining_budget -= player['price']
-                position_counts[pos] += 1
-                bench_count += 1
-                
-            if bench_count >= config.BENCH_SIZE:
-                break
-        
-        # If we didn't fill all positions, warn the user
-        if len(selected) < config.TEAM_SIZE:
-            print(f"\n⚠ WARNING: Could only select {len(selected)}/{config.TEAM_SIZE} players within budget")
-            print(f"  Remaining budget: ${remaining_budget:,}")
-            print(f"  Consider adjusting strategy or checking data quality")
-        
-        # Create team DataFrame
-        self.selected_team = pd.DataFrame(selected)
+        bench_picks, remaining_budget = _greedy_bench(
+            bench_rows, prices, pos_codes, remaining_budget, position_counts, max_per_pos, config.BENCH_SIZE
+        )
+        selected.extend(bench_picks)
+        selected_onfield.extend([False] * len(bench_picks))
         
-        # Calculate statistics
-        total_cost = self.selected_team['price'].sum()
-        onfield_players = self.selected_team[self.selected_team['onfield'] == True]
-        onfield_score = onfield_players['predicted_score'].sum() if len(onfield_players) > 0 else 0
-        avg_value = self.selected_team['adjusted_value'].mean()
-        
-        print(f"\nTeam Selection Complete!")
-        print(f"Total Players: {len(self.selected_team)}/{config.TEAM_SIZE}")
-        target_bench_price = remaining_budget / config.BENCH_SIZE if remaining_budget > 0 else 100000
-        print(f"  Target bench price: ~${target_bench_price:,.0f} each")
-        
-        bench_count = 0
-        for _, player in remaining_players.iterrows():
-            pos = player['position']
-            # Check if we can add more of this position and afford it
-            if (bench_count < config.BENCH_SIZE and 
-                player['price'] <= remaining_budget and
-                position_counts[pos] < config.POSITION_REQUIREMENTS[pos]['max']):
-                player_dict = player.to_dict()
-                player_dict['onfield'] = False
-                selected.append(player_dict)
-                remaining_budget -= player['price']
-                position_counts[pos] += 1
-                bench_count += 1
-                
-            if bench_count >= config.BENCH_SIZE:
-                break
+        # Refine the greedy picks with improving same-position swaps
+        selected, swaps, gain = self._two_opt_improve(
+            objective.astype(np.float64), prices, pos_codes, selected, selected_onfield
+        )
+        if swaps:
+            remaining_budget = config.SALARY_CAP - int(prices[selected].sum())
+            print(f"\nLocal search: {swaps} swap(s), objective +{gain:.2f}")
         
         # If we didn't fill all positions, warn the user
         if len(selected) < config.TEAM_SIZE:
@@ -177,13 +332,13 @@ class TeamOptimizer:
             print(f"  Consider adjusting player valuations or increasing budget")
         
         # Create team DataFrame
-        self.selected_team = pd.DataFrame(selected)
+        self.selected_team = self._build_team(players_df, order[selected], selected_onfield, objective[selected])
         
         # Calculate statistics
-        total_cost = self.selected_team['price'].sum()
-        onfield_players = self.selected_team[self.selected_team['onfield'] == True]
-        onfield_score = onfield_players['predicted_score'].sum() if len(onfield_players) > 0 else 0
-        avg_value = self.selected_team['adjusted_value'].mean()
+        stats = self._team_stats()
+        total_cost = stats['total_cost']
+        onfield_score = stats['onfield_score']
+        avg_value = stats['avg_value']
         
         print(f"\nTeam Selection Complete!")
         print(f"Total Players: {len(self.selected_team)}/{config.TEAM_SIZE}")
@@ -192,23 +347,192 @@ class TeamOptimizer:
         print(f"Onfield (Starting 22) Predicted Score: {onfield_score:.2f}")
         print(f"Average Value Score: {avg_value:.2f}")
         print(f"\nPosition Breakdown:")
-        for pos in ['DEF', 'MID', 'RUC', 'FWD']:
-            count = position_counts[pos]
-            req = config.POSITION_REQUIREMENTS[pos]
-            onfield = config.POSITION_REQUIREMENTS[pos]['on_field']
+        for code, pos in enumerate(config.POS_ORDER):
+            count = position_counts[code]
+            onfield = onfield_per_pos[code]
             bench = count - onfield
-            status = "✓" if count >= req['min'] and count <= req['max'] else "✗"
+            status = "✓" if min_per_pos[code] <= count <= max_per_pos[code] else "✗"
             print(f"  {status} {pos}: {count} total ({onfield} onfield + {bench} bench)")
         
         return self.selected_team
     
+    def _two_opt_improve(self, objective, prices, pos_codes, rows, onfield, max_swaps=1000):
+        """
+        Improve a selection with 1-for-1 same-position swaps (2-opt)
+        
+        Repeatedly applies the best swap of a selected player for an
+        unselected player of the same position that raises the objective
+        (starting players weighted 1, bench ILP_BENCH_WEIGHT, as in the ILP)
+        and keeps the squad within the salary cap. Position counts and
+        onfield slots never change. Returns (rows, swaps made, objective gain).
+        """
+        rows = np.array(rows, dtype=np.intp)
+        weights = np.where(np.asarray(onfield, dtype=bool), 1.0, ILP_BENCH_WEIGHT)
+        available = np.ones(len(objective), dtype=bool)
+        available[rows] = False
+        budget = config.SALARY_CAP - prices[rows].sum()
+        swaps = 0
+        gain = 0.0
+        while swaps < max_swaps:
+            # Gain and extra cost of every (selected slot, unselected player) swap
+            candidates = np.flatnonzero(available)
+            delta = (objective[candidates][None, :] - objective[rows][:, None]) * weights[:, None]
+            extra_cost = prices[candidates][None, :] - prices[rows][:, None]
+            allowed = (
+                (pos_codes[candidates][None, :] == pos_codes[rows][:, None]) &
+                (extra_cost <= budget) &
+                (delta > 1e-9)
+            )
+            if not allowed.any():
+                break
+            slot, j = np.unravel_index(np.argmax(np.where(allowed, delta, -np.inf)), delta.shape)
+            available[rows[slot]] = True
+            available[candidates[j]] = False
+            budget -= extra_cost[slot, j]
+            gain += delta[slot, j]
+            rows[slot] = candidates[j]
+            swaps += 1
+        return list(rows), swaps, gain
+    
+    def optimize_team_ilp(self, players_df, strategy='max_score', time_limit=None):
+        """
+        Optimal team selection as a 0/1 integer linear program
+        
+        Each player has two binary variables: x (in the squad) and y (in the
+        starting 22, y <= x). Maximizes the strategy objective of the starting
+        22 (bench players count ILP_BENCH_WEIGHT as much) subject to:
+        - squad cost <= SALARY_CAP and squad size == TEAM_SIZE
+        - min <= squad players per position <= max
+        - starting players per position == on_field
+        
+        Solved with scipy.optimize.milp (HiGHS branch-and-cut), which proves
+        optimality in well under a second for a full AFL list. Strategies are
+        the same as optimize_team.
+        """
+        _check_scored(players_df)
+        
+        # scipy.optimize is slow to import and only the ILP path needs it
+        from scipy.optimize import milp, LinearConstraint, Bounds
+        from scipy.sparse import csr_matrix, hstack, identity
+        
+        print("\n" + "="*60)
+        print("OPTIMIZING TEAM SELECTION (ILP) - SUPERCOACH 2026 RULES")
+        print(f"Strategy: {strategy.upper()}")
+        print("="*60)
+        
+        df = players_df.copy()
+        if strategy == 'max_score':
+            df['objective'] = df['overall_rank_score']
+        elif strategy == 'value':
+            df['objective'] = df['adjusted_value']
+        else:  # balanced
+            df['objective'] = df['predicted_score'] * df['adjusted_value']
+        df = df.sort_values('objective', ascending=False).reset_index(drop=True)
+        
+        n = len(df)
+        objective = df['objective'].to_numpy(dtype=np.float64)
+        prices = df['price'].to_numpy(dtype=np.float64)
+        positions = df['position'].to_numpy()
+        
+        # Variables are [x_0..x_n-1, y_0..y_n-1]; milp minimizes, so negate
+        c = np.concatenate([-ILP_BENCH_WEIGHT * objective, -(1 - ILP_BENCH_WEIGHT) * objective])
+        
+        squad = csr_matrix(np.vstack([prices, np.ones(n)]))
+        pos_onehot = csr_matrix(
+            np.vstack([positions == pos for pos in config.POS_ORDER]).astype(np.float64)
+        )
+        mins, maxs, on_field = config.POS_REQ_ARRAY.T.astype(np.float64)
+        zeros = csr_matrix((len(config.POS_ORDER), n))
+        
+        constraints = [
+            # Budget and squad size
+            LinearConstraint(hstack([squad, csr_matrix((2, n))]),
+                             [-np.inf, config.TEAM_SIZE], [config.SALARY_CAP, config.TEAM_SIZE]),
+            # Squad and starting counts per position
+            LinearConstraint(hstack([pos_onehot, zeros]), mins, maxs),
+            LinearConstraint(hstack([zeros, pos_onehot]), on_field, on_field),
+            # Only squad players can start: y - x <= 0
+            LinearConstraint(hstack([-identity(n), identity(n)]), -np.inf, 0),
+        ]
+        
+        options = {} if time_limit is None else {'time_limit': time_limit}
+        result = milp(c, constraints=constraints, integrality=np.ones(2 * n),
+                      bounds=Bounds(0, 1), options=options)
+        if result.x is None:
+            raise ValueError(f"No legal {config.TEAM_SIZE}-player squad fits the salary cap: {result.message}")
+        
+        chosen = result.x > 0.5
+        in_squad, onfield = chosen[:n], chosen[n:]
+        
+        # Starting players first, each group in objective order
+        rows = np.concatenate([np.flatnonzero(onfield), np.flatnonzero(in_squad & ~onfield)])
+        self.selected_team = self._build_team(df, rows, onfield[rows])
+        
+        stats = self._team_stats()
+        print(f"\nSolver status: {result.message}")
+        print(f"Total Players: {len(self.selected_team)}/{config.TEAM_SIZE}")
+        print(f"Total Cost: ${stats['total_cost']:,} / ${config.SALARY_CAP:,}")
+        print(f"Onfield (Starting 22) Predicted Score: {stats['onfield_score']:.2f}")
+        print(f"Average Value Score: {stats['avg_value']:.2f}")
+        
+        return self.selected_team
+    
+    def _build_team(self, df, rows, onfield, objective=None):
+        """
+        Build the team DataFrame from selected df row positions and onfield flags
+        
+        `objective`, if given, holds the selected players' objective values
+        (in `rows` order) for the team's objective column.
+        """
+        team = df.iloc[np.asarray(rows, dtype=np.intp)].reset_index(drop=True)
+        # Team and position hold plain labels in the team table (sorting and
+        # counting by label, not by category order)
+        for col in team.select_dtypes('category').columns:
+            team[col] = team[col].astype(team[col].cat.categories.dtype)
+        if objective is not None:
+            team['objective'] = objective
+        team['onfield'] = np.asarray(onfield, dtype=bool)
+        return team
+    
+    def _team_split(self):
+        """
+        (starting, bench) frames of selected_team
+        
+        Split once per selected team and reused by the report methods, which
+        only read them; the public getters build new frames instead.
+        """
+        if self._split_from is not self.selected_team:
+            onfield = self.selected_team['onfield'].to_numpy(dtype=bool)
+            self._split = (self.selected_team[onfield], self.selected_team[~onfield])
+            self._split_from = self.selected_team
+        return self._split
+    
+    def _team_stats(self):
+        """Summary statistics of selected_team, computed once per selected team"""
+        if self._stats_from is not self.selected_team:
+            team = self.selected_team
+            prices = team['price']
+            self._stats = {
+                'total_cost': prices.sum(),
+                'min_price': prices.min(),
+                'max_price': prices.max(),
+                'avg_price': prices.mean(),
+                'onfield_score': self._team_split()[0]['predicted_score'].sum(),
+                'avg_value': team['adjusted_value'].mean(),
+                'avg_age': team['age'].mean(),
+                'avg_injury': team['injury_history'].mean(),
+            }
+            self._stats_from = team
+        return self._stats
+    
     def get_starting_lineup(self):
         """Get the starting 22 onfield players"""
         if self.selected_team is None:
             raise ValueError("No team selected.")
         
-        # Return players marked as onfield
-        return self.selected_team[self.selected_team['onfield'] == True].copy()
+        # Return players marked as onfield (an independent copy: without
+        # copy-on-write, pandas 2 still ties a filtered frame to its parent)
+        return self.selected_team[self.selected_team['onfield']].copy()
     
     def get_bench_players(self):
         """Get the 8 bench players"""
@@ -216,8 +540,9 @@ class TeamOptimizer:
             raise ValueError("No team selected.")
         
         # Return players marked as bench
-        return self.selected_team[self.selected_team['onfield'] == False].copy()
+        return self.selected_team[~self.selected_team['onfield']].copy()
     
+    @buffered_output
     def display_team(self):
         """Display formatted team selection following Supercoach 2026 rules"""
         if self.selected_team is None:
@@ -227,37 +552,31 @@ class TeamOptimizer:
         print("2026 AFL SUPERCOACH OPTIMAL TEAM - SUPERCOACH RULES")
         print("="*80)
         
-        starting = self.get_starting_lineup()
+        starting, bench = self._team_split()
         
         print("\n--- STARTING LINEUP (22 ONFIELD PLAYERS) ---")
-        for position in ['DEF', 'MID', 'RUC', 'FWD']:
+        starting_lines = _display_lines_by_position(starting)
+        for position in config.POS_ORDER:
             print(f"\n{position}:")
-            pos_players = starting[starting['position'] == position]
-            for _, player in pos_players.iterrows():
-                print(f"  {player['name']:25s} ({player['team']:15s}) - "
-                      f"${player['price']:7,} - Score: {player['predicted_score']:6.2f} - "
-                      f"Value: {player['adjusted_value']:5.2f}")
+            if position in starting_lines:
+                print(starting_lines[position])
         
         print("\n--- BENCH (8 EMERGENCY PLAYERS) ---")
-        bench = self.get_bench_players()
         # Group bench by position for better display
-        for position in ['DEF', 'MID', 'RUC', 'FWD']:
-            pos_bench = bench[bench['position'] == position]
-            if len(pos_bench) > 0:
+        bench_lines = _display_lines_by_position(bench)
+        for position in config.POS_ORDER:
+            if position in bench_lines:
                 print(f"\n{position} Bench:")
-                for _, player in pos_bench.iterrows():
-                    print(f"  {player['name']:25s} ({player['team']:15s}) - "
-                          f"${player['price']:7,} - Score: {player['predicted_score']:6.2f} - "
-                          f"Value: {player['adjusted_value']:5.2f}")
+                print(bench_lines[position])
         
-        total_cost = self.selected_team['price'].sum()
-        total_score = starting['predicted_score'].sum()
+        stats = self._team_stats()
+        total_cost = stats['total_cost']
         
         print("\n" + "="*80)
         print(f"Total Squad Cost: ${total_cost:,} / ${config.SALARY_CAP:,}")
         print(f"Money Remaining: ${config.SALARY_CAP - total_cost:,}")
-        print(f"Expected Weekly Score (Starting 22): {total_score:.2f}")
-        print(f"Average Value: {self.selected_team['adjusted_value'].mean():.2f}")
+        print(f"Expected Weekly Score (Starting 22): {stats['onfield_score']:.2f}")
+        print(f"Average Value: {stats['avg_value']:.2f}")
         print(f"Team Composition: {len(starting)} onfield + {len(bench)} bench = {config.TEAM_SIZE} total")
         print("="*80)
     
@@ -274,22 +593,32 @@ class TeamOptimizer:
             raise ValueError("No team selected.")
         
         # Create Excel writer
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+        # Sort the full team once: starting before bench, then position
+        # (alphabetical) and score descending, as one stable np.lexsort (last
+        # key is primary). Starting and bench sheets are split off that order
+        team = self.selected_team
+        onfield = team['onfield'].to_numpy(dtype=bool)
+        order = np.lexsort((
+            -team['predicted_score'].to_numpy(dtype=np.float64),
+            pd.Categorical(team['position']).codes,
+            ~onfield,
+        ))
+        full_team_sorted = team.iloc[order]
+        starting_sorted = full_team_sorted[onfield[order]]
+        bench_sorted = full_team_sorted[~onfield[order]]
+        
+        with pd.ExcelWriter(filepath, engine=EXCEL_ENGINE) as writer:
             # Starting lineup (22 onfield players)
-            starting = self.get_starting_lineup()
-            starting_sorted = starting.sort_values(['position', 'predicted_score'], ascending=[True, False])
             starting_sorted.to_excel(writer, sheet_name='Starting 22 (Onfield)', index=False)
             
             # Bench (8 players)
-            bench = self.get_bench_players()
-            bench_sorted = bench.sort_values(['position', 'predicted_score'], ascending=[True, False])
             bench_sorted.to_excel(writer, sheet_name='Bench (8 Emergency)', index=False)
             
             # Full team
-            full_team_sorted = self.selected_team.sort_values(['onfield', 'position', 'predicted_score'], ascending=[False, True, False])
             full_team_sorted.to_excel(writer, sheet_name='Full Team', index=False)
             
             # Summary statistics
+            stats = self._team_stats()
             summary_data = {
                 'Metric': [
                     'Total Players',
@@ -305,15 +634,15 @@ class TeamOptimizer:
                 ],
                 'Value': [
                     len(self.selected_team),
-                    len(starting),
-                    len(bench),
-                    f"${self.selected_team['price'].sum():,}",
+                    len(starting_sorted),
+                    len(bench_sorted),
+                    f"${stats['total_cost']:,}",
                     f"${config.SALARY_CAP:,}",
-                    f"${config.SALARY_CAP - self.selected_team['price'].sum():,}",
-                    f"{starting['predicted_score'].sum():.2f}",
-                    f"{self.selected_team['adjusted_value'].mean():.2f}",
-                    f"{self.selected_team['age'].mean():.1f}",
-                    f"{self.selected_team['injury_history'].mean():.2f}"
+                    f"${config.SALARY_CAP - stats['total_cost']:,}",
+                    f"{stats['onfield_score']:.2f}",
+                    f"{stats['avg_value']:.2f}",
+                    f"{stats['avg_age']:.1f}",
+                    f"{stats['avg_injury']:.2f}"
                 ]
             }
             summary_df = pd.DataFrame(summary_data)
@@ -321,6 +650,7 @@ class TeamOptimizer:
         
         print(f"\nTeam saved to Excel: {filepath}")
     
+    @buffered_output
     def analyze_team_balance(self):
         """Analyze team composition"""
         if self.selected_team is None:
@@ -328,7 +658,8 @@ class TeamOptimizer:
         
         print("\n--- TEAM ANALYSIS ---")
         
-        avg_age = self.selected_team['age'].mean()
+        stats = self._team_stats()
+        avg_age = stats['avg_age']
         print(f"Average Age: {avg_age:.1f}")
         
         team_counts = self.selected_team['team'].value_counts()
@@ -337,15 +668,15 @@ class TeamOptimizer:
         for team, count in team_counts.head(5).items():
             print(f"  {team}: {count}")
         
-        print(f"\nPrice Range: ${self.selected_team['price'].min():,} - ${self.selected_team['price'].max():,}")
-        print(f"Average Price: ${self.selected_team['price'].mean():,.0f}")
+        print(f"\nPrice Range: ${stats['min_price']:,} - ${stats['max_price']:,}")
+        print(f"Average Price: ${stats['avg_price']:,.0f}")
         
-        avg_injury = self.selected_team['injury_history'].mean()
+        avg_injury = stats['avg_injury']
         print(f"\nAverage Injury History: {avg_injury:.2f}")
         
         return {
             'avg_age': avg_age,
             'team_diversity': len(team_counts),
-            'avg_price': self.selected_team['price'].mean(),
+            'avg_price': stats['avg_price'],
             'avg_injury_risk': avg_injury
         }
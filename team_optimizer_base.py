@@ -0,0 +1,235 @@
+"""
+Shared base for the legacy team optimizers
+
+team_optimizer_old and team_optimizer_budget_alloc differ only in how they
+spend the salary cap; the ranking, the team table and the reports live here.
+"""
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+import config
+from output_utils import buffered_output
+
+# These optimizers fill a separate 'BENCH' slot, so they use the strict layout
+POSITION_REQUIREMENTS = config.get_position_requirements('strict')
+
+# Slots of that layout in report order; per-slot counts are arrays indexed
+# through SLOT_INDEX
+SLOTS = config.POS_ORDER + ('BENCH',)
+SLOT_INDEX = {slot: i for i, slot in enumerate(SLOTS)}
+
+
+def _first_fit(prices, budget, needed):
+    """
+    Greedy first-fit over prices, in the order given
+    
+    Takes each player whose price still fits in the budget until needed
+    players are picked. Returns (picked positions, amount spent).
+    """
+    # The leading players whose running total fits are all taken (one
+    # binary search); the scan continues after the first one that misses
+    affordable = int(np.searchsorted(np.cumsum(prices), budget, side='right'))
+    picked = list(range(min(affordable, needed)))
+    spent = prices[picked].sum()
+    for i in range(affordable + 1, len(prices)):
+        if len(picked) >= needed:
+            break
+        if spent + prices[i] <= budget:
+            picked.append(i)
+            spent += prices[i]
+    return picked, spent
+
+
+class BaseTeamOptimizer(ABC):
+    """Team selection reports shared by the legacy optimizers; subclasses pick the squad"""
+    
+    def __init__(self):
+        self.selected_team = None
+        self.optimization_result = None
+        # Starting lineup of selected_team and the team it was picked from
+        self._starting = None
+        self._starting_from = None
+        
+    @abstractmethod
+    def optimize_team(self, players_df, strategy='balanced'):
+        """Select a squad from players_df and store it in selected_team"""
+    
+    def _rank_players(self, players_df, strategy):
+        """
+        Rank players_df for selection
+        
+        Returns (df, objective, by_objective, by_price, min_prices): df is
+        players_df with row labels 0..n-1, objective the strategy's score
+        aligned to df, by_objective / by_price each position's players best
+        first / cheapest first, and min_prices the cheapest legal fill of
+        each position plus the cheapest bench.
+        """
+        # Prepare data (row labels 0..n-1, so picks can be kept as labels)
+        df = players_df.reset_index(drop=True)
+        
+        # Choose objective based on strategy. It is kept as its own Series
+        # aligned to df, so the input frame is never copied or mutated
+        if strategy == 'value':
+            objective = df['adjusted_value']
+        elif strategy == 'high_score':
+            objective = df['predicted_score']
+        else:  # balanced: 0.7 * score + 0.3 * value, accumulated in place
+            blended = df['predicted_score'].to_numpy(dtype=np.float64) * 0.7
+            blended += df['adjusted_value'].to_numpy(dtype=np.float64) * 0.3
+            objective = pd.Series(blended, index=df.index)
+        
+        # Players of each position by objective (best first) and by price
+        # (cheapest first, ties in objective order), sorted once for all phases.
+        # Positions are matched on integer category codes, not string labels
+        pos_codes = pd.Categorical(df['position'], categories=config.POS_ORDER).codes
+        by_objective = {pos: df.loc[objective[pos_codes == code].sort_values(ascending=False).index]
+                        for code, pos in enumerate(config.POS_ORDER)}
+        by_price = {pos: players.sort_values('price', kind='stable') for pos, players in by_objective.items()}
+        
+        # Cheapest players that fill each position's minimum
+        min_prices = {}
+        for pos in config.POS_ORDER:
+            required = POSITION_REQUIREMENTS[pos]['min']
+            min_prices[pos] = by_price[pos]['price'].iloc[:required].sum()
+        
+        # Reserve for bench (cheapest 8 players overall)
+        bench_needed = POSITION_REQUIREMENTS['BENCH']['min']
+        min_prices['BENCH'] = df.nsmallest(bench_needed, 'price')['price'].sum()
+        
+        return df, objective, by_objective, by_price, min_prices
+    
+    def _build_team(self, df, selected_rows, objective):
+        """Store the players at df row labels selected_rows as selected_team"""
+        team = df.loc[selected_rows].reset_index(drop=True)
+        team['objective'] = objective[selected_rows].to_numpy()
+        # Team and position hold plain labels in the team table (counting and
+        # grouping by label, not over every category)
+        for col in team.select_dtypes('category').columns:
+            team[col] = team[col].astype(team[col].cat.categories.dtype)
+        self.selected_team = team
+    
+    def get_starting_lineup(self):
+        """Get the starting 22 players (on-field)"""
+        if self.selected_team is None:
+            raise ValueError("No team selected. Call optimize_team() first.")
+        
+        # Picked once per selected team (display_team asks for it twice);
+        # callers get a deep copy so they cannot change the cached frame (a
+        # shallow copy shares its data without pandas copy-on-write)
+        if self._starting_from is not self.selected_team:
+            self._starting = self._pick_starting_lineup()
+            self._starting_from = self.selected_team
+        return self._starting.copy()
+    
+    def _pick_starting_lineup(self):
+        """Rank selected_team and keep the best on_field players of each position"""
+        team = self.selected_team
+        positions = config.POS_ORDER
+        
+        # Players by position, then predicted score (best first, ties in
+        # team order), in one stable sort
+        codes = pd.Categorical(team['position'], categories=positions).codes
+        order = np.lexsort((-team['predicted_score'].to_numpy(dtype=np.float64), codes))
+        order = order[codes[order] >= 0]
+        ranked = team.iloc[order]
+        
+        # Select top players by predicted score: the first on_field of each position
+        rank = ranked.groupby('position', sort=False).cumcount().to_numpy()
+        on_field = np.array([POSITION_REQUIREMENTS[pos]['on_field'] for pos in positions])
+        return ranked[rank < on_field[codes[order]]]
+    
+    def get_bench_players(self):
+        """Get bench players"""
+        if self.selected_team is None:
+            raise ValueError("No team selected. Call optimize_team() first.")
+        
+        starting = self.get_starting_lineup()
+        bench = self.selected_team[~self.selected_team['player_id'].isin(starting['player_id'])]
+        return bench
+    
+    @buffered_output
+    def display_team(self):
+        """Display formatted team selection"""
+        if self.selected_team is None:
+            raise ValueError("No team selected. Call optimize_team() first.")
+        
+        print("\n" + "="*80)
+        print("2026 AFL SUPERCOACH OPTIMAL TEAM")
+        print("="*80)
+        
+        # Starting lineup
+        print("\n--- STARTING LINEUP ---")
+        starting = self.get_starting_lineup()
+        
+        for position in config.POS_ORDER:
+            print(f"\n{position}:")
+            pos_players = starting[starting['position'] == position]
+            # Plain tuples of the printed columns (no per-row Series)
+            rows = pos_players[['name', 'team', 'price', 'predicted_score', 'adjusted_value']].itertuples(
+                index=False, name=None)
+            for name, team, price, score, value in rows:
+                print(f"  {name:25s} ({team:15s}) - "
+                      f"${price:7,} - Score: {score:6.2f} - "
+                      f"Value: {value:5.2f}")
+        
+        # Bench
+        print("\n--- BENCH ---")
+        bench = self.get_bench_players()
+        for name, team, price, score in bench[['name', 'team', 'price', 'predicted_score']].itertuples(index=False, name=None):
+            print(f"  {name:25s} ({team:15s}) - "
+                  f"${price:7,} - Score: {score:6.2f}")
+        
+        # Summary
+        total_cost = self.selected_team['price'].sum()
+        total_score = starting['predicted_score'].sum()
+        
+        print("\n" + "="*80)
+        print(f"Total Squad Cost: ${total_cost:,} / ${config.SALARY_CAP:,}")
+        print(f"Money Remaining: ${config.SALARY_CAP - total_cost:,}")
+        print(f"Expected Weekly Score: {total_score:.2f}")
+        print(f"Average Value: {self.selected_team['adjusted_value'].mean():.2f}")
+        print("="*80)
+    
+    def save_team(self, filepath='optimal_team.csv'):
+        """Save team to CSV"""
+        if self.selected_team is None:
+            raise ValueError("No team selected.")
+        
+        self.selected_team.to_csv(filepath, index=False)
+        print(f"\nTeam saved to {filepath}")
+    
+    @buffered_output
+    def analyze_team_balance(self):
+        """Analyze team composition and balance"""
+        if self.selected_team is None:
+            raise ValueError("No team selected.")
+        
+        print("\n--- TEAM ANALYSIS ---")
+        
+        # Age distribution
+        avg_age = self.selected_team['age'].mean()
+        print(f"Average Age: {avg_age:.1f}")
+        
+        # Team diversity
+        team_counts = self.selected_team['team'].value_counts()
+        print(f"\nTeam Diversity: {len(team_counts)} different AFL teams")
+        print("Players per team:")
+        for team, count in team_counts.head(5).items():
+            print(f"  {team}: {count}")
+        
+        # Price distribution
+        print(f"\nPrice Range: ${self.selected_team['price'].min():,} - "
+              f"${self.selected_team['price'].max():,}")
+        print(f"Average Price: ${self.selected_team['price'].mean():,.0f}")
+        
+        # Risk assessment
+        avg_injury = self.selected_team['injury_history'].mean()
+        print(f"\nAverage Injury History: {avg_injury:.2f}")
+        
+        return {
+            'avg_age': avg_age,
+            'team_diversity': len(team_counts),
+            'avg_price': self.selected_team['price'].mean(),
+            'avg_injury_risk': avg_injury
+        }
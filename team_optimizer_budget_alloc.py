@@ -2,18 +2,15 @@
 Team optimization module using constraint-based optimization - Fixed version
 """
 import numpy as np
-import pandas as pd
-from scipy.optimize import linprog
 import config
+from output_utils import buffered_output
+from team_optimizer_base import BaseTeamOptimizer, POSITION_REQUIREMENTS, SLOTS, SLOT_INDEX, _first_fit
 
 
-class TeamOptimizer:
+class TeamOptimizer(BaseTeamOptimizer):
     """Optimizes team selection based on predicted performance and constraints"""
     
-    def __init__(self):
-        self.selected_team = None
-        self.optimization_result = None
-        
+    @buffered_output
     def optimize_team(self, players_df, strategy='balanced'):
         """
         Optimize team selection with guaranteed budget compliance
@@ -26,27 +23,7 @@ class TeamOptimizer:
         print("OPTIMIZING TEAM SELECTION")
         print("="*60)
         
-        # Prepare data
-        df = players_df.copy()
-        
-        # Choose objective based on strategy
-        if strategy == 'value':
-            df['objective'] = df['adjusted_value']
-        elif strategy == 'high_score':
-            df['objective'] = df['predicted_score']
-        else:  # balanced
-            df['objective'] = df['predicted_score'] * 0.7 + df['adjusted_value'] * 0.3
-        
-        # Calculate budget allocation to ensure all positions can be filled
-        min_prices = {}
-        for pos in ['DEF', 'MID', 'RUC', 'FWD']:
-            required = config.POSITION_REQUIREMENTS[pos]['min']
-            pos_players = df[df['position'] == pos].nsmallest(required, 'price')
-            min_prices[pos] = pos_players['price'].sum()
-        
-        # Reserve for bench
-        bench_needed = config.POSITION_REQUIREMENTS['BENCH']['min']
-        min_prices['BENCH'] = df.nsmallest(bench_needed, 'price')['price'].sum()
+        df, objective, by_objective, by_price, min_prices = self._rank_players(players_df, strategy)
         
         total_min = sum(min_prices.values())
         buffer = config.SALARY_CAP - total_min
@@ -60,74 +37,76 @@ class TeamOptimizer:
             'BENCH': min_prices['BENCH'] + buffer * 0.05
         }
         
-        selected_players = []
-        position_counts = {pos: 0 for pos in config.POSITION_REQUIREMENTS.keys()}
+        # Selected players as df row labels, and their player_ids
+        selected_rows = []
+        selected_ids = set()
+        position_counts = np.zeros(len(SLOTS), dtype=np.int64)
         total_spent = 0
         
         # Phase 1: Fill each position within allocated budget
         for position in ['MID', 'DEF', 'FWD', 'RUC']:
-            pos_df = df[df['position'] == position].sort_values('objective', ascending=False).copy()
-            required = config.POSITION_REQUIREMENTS[position]['min']
+            pos_df = by_objective[position]
+            required = POSITION_REQUIREMENTS[position]['min']
             budget_for_position = position_budgets[position]
             
-            count = 0
-            spent = 0
-            
-            for _, player in pos_df.iterrows():
-                if count < required and spent + player['price'] <= budget_for_position:
-                    selected_players.append(player.to_dict())
-                    spent += player['price']
-                    total_spent += player['price']
-                    position_counts[position] += 1
-                    count += 1
-                if count >= required:
-                    break
+            # Take the best players that fit the position budget; the picked
+            # rows are recorded once, after the scan
+            prices = pos_df['price'].to_numpy(dtype=np.int64)
+            picked, spent = _first_fit(prices, budget_for_position, required)
+            total_spent += spent
+            selected_rows.extend(pos_df.index[picked])
+            selected_ids.update(pos_df['player_id'].iloc[picked])
+            position_counts[SLOT_INDEX[position]] += len(picked)
+            count = len(picked)
             
             # If couldn't fill within position budget, use remaining global budget
             if count < required:
                 remaining_budget = config.SALARY_CAP - total_spent
-                cheaper_df = pos_df.sort_values('price')
-                for _, player in cheaper_df.iterrows():
-                    if player['player_id'] not in [p['player_id'] for p in selected_players]:
-                        if count < required and player['price'] <= remaining_budget:
-                            selected_players.append(player.to_dict())
-                            total_spent += player['price']
-                            remaining_budget -= player['price']
-                            position_counts[position] += 1
+                cheaper_df = by_price[position]
+                player_ids = cheaper_df['player_id'].to_numpy()
+                prices = cheaper_df['price'].to_numpy(dtype=np.int64)
+                picked = []
+                for i in range(len(prices)):
+                    if player_ids[i] not in selected_ids:
+                        if count < required and prices[i] <= remaining_budget:
+                            picked.append(i)
+                            selected_ids.add(player_ids[i])
+                            total_spent += prices[i]
+                            remaining_budget -= prices[i]
                             count += 1
                         if count >= required:
                             break
+                selected_rows.extend(cheaper_df.index[picked])
+                position_counts[SLOT_INDEX[position]] += len(picked)
         
         # Phase 2: Fill bench with remaining budget
+        bench_needed = POSITION_REQUIREMENTS['BENCH']['min']
         bench_budget = config.SALARY_CAP - total_spent
-        selected_ids = [p['player_id'] for p in selected_players]
         remaining_df = df[~df['player_id'].isin(selected_ids)].sort_values('adjusted_value', ascending=False)
         
-        bench_count = 0
-        for _, player in remaining_df.iterrows():
-            if bench_count < bench_needed and player['price'] <= bench_budget:
-                selected_players.append(player.to_dict())
-                bench_budget -= player['price']
-                total_spent += player['price']
-                position_counts['BENCH'] += 1
-                bench_count += 1
+        prices = remaining_df['price'].to_numpy(dtype=np.int64)
+        picked, spent = _first_fit(prices, bench_budget, bench_needed)
+        bench_budget -= spent
+        total_spent += spent
+        selected_rows.extend(remaining_df.index[picked])
+        selected_ids.update(remaining_df['player_id'].iloc[picked])
+        position_counts[SLOT_INDEX['BENCH']] += len(picked)
+        bench_count = len(picked)
         
         # If still short on bench, get absolute cheapest
         if bench_count < bench_needed:
-            remaining_ids = [p['player_id'] for p in selected_players]
-            cheapest_df = df[~df['player_id'].isin(remaining_ids)].sort_values('price')
-            for _, player in cheapest_df.iterrows():
-                if bench_count < bench_needed and player['price'] <= bench_budget:
-                    selected_players.append(player.to_dict())
-                    bench_budget -= player['price']
-                    total_spent += player['price']
-                    position_counts['BENCH'] += 1
-                    bench_count += 1
-                if bench_count >= bench_needed:
-                    break
+            cheapest_df = df[~df['player_id'].isin(selected_ids)].sort_values('price')
+            prices = cheapest_df['price'].to_numpy(dtype=np.int64)
+            picked, spent = _first_fit(prices, bench_budget, bench_needed - bench_count)
+            bench_budget -= spent
+            total_spent += spent
+            bench_count += len(picked)
+            selected_rows.extend(cheapest_df.index[picked])
+            selected_ids.update(cheapest_df['player_id'].iloc[picked])
+            position_counts[SLOT_INDEX['BENCH']] += len(picked)
         
         # Create team DataFrame
-        self.selected_team = pd.DataFrame(selected_players)
+        self._build_team(df, selected_rows, objective)
         
         # Calculate statistics
         total_cost = self.selected_team['price'].sum()
@@ -141,118 +120,9 @@ class TeamOptimizer:
         print(f"Total Predicted Score: {total_predicted_score:.2f}")
         print(f"Average Value Score: {avg_value:.2f}")
         print(f"\nPosition Breakdown:")
-        for pos in ['DEF', 'MID', 'RUC', 'FWD', 'BENCH']:
-            count = position_counts[pos]
-            req = config.POSITION_REQUIREMENTS[pos]
+        for pos, count in zip(SLOTS, position_counts):
+            req = POSITION_REQUIREMENTS[pos]
             status = "✓" if count >= req['min'] and count <= req['max'] else "✗"
             print(f"  {status} {pos}: {count} (required: {req['min']}-{req['max']})")
         
         return self.selected_team
-    
-    def get_starting_lineup(self):
-        """Get the starting 22 players (on-field)"""
-        if self.selected_team is None:
-            raise ValueError("No team selected. Call optimize_team() first.")
-        
-        starting_lineup = []
-        
-        for position in ['DEF', 'MID', 'RUC', 'FWD']:
-            pos_players = self.selected_team[self.selected_team['position'] == position]
-            on_field = config.POSITION_REQUIREMENTS[position]['on_field']
-            
-            # Select top players by predicted score
-            top_players = pos_players.nlargest(on_field, 'predicted_score')
-            starting_lineup.append(top_players)
-        
-        starting_df = pd.concat(starting_lineup)
-        return starting_df
-    
-    def get_bench_players(self):
-        """Get bench players"""
-        if self.selected_team is None:
-            raise ValueError("No team selected. Call optimize_team() first.")
-        
-        starting = self.get_starting_lineup()
-        bench = self.selected_team[~self.selected_team['player_id'].isin(starting['player_id'])]
-        return bench
-    
-    def display_team(self):
-        """Display formatted team selection"""
-        if self.selected_team is None:
-            raise ValueError("No team selected. Call optimize_team() first.")
-        
-        print("\n" + "="*80)
-        print("2026 AFL SUPERCOACH OPTIMAL TEAM")
-        print("="*80)
-        
-        # Starting lineup
-        print("\n--- STARTING LINEUP ---")
-        starting = self.get_starting_lineup()
-        
-        for position in ['DEF', 'MID', 'RUC', 'FWD']:
-            print(f"\n{position}:")
-            pos_players = starting[starting['position'] == position]
-            for _, player in pos_players.iterrows():
-                print(f"  {player['name']:25s} ({player['team']:15s}) - "
-                      f"${player['price']:7,} - Score: {player['predicted_score']:6.2f} - "
-                      f"Value: {player['adjusted_value']:5.2f}")
-        
-        # Bench
-        print("\n--- BENCH ---")
-        bench = self.get_bench_players()
-        for _, player in bench.iterrows():
-            print(f"  {player['name']:25s} ({player['team']:15s}) - "
-                  f"${player['price']:7,} - Score: {player['predicted_score']:6.2f}")
-        
-        # Summary
-        total_cost = self.selected_team['price'].sum()
-        total_score = starting['predicted_score'].sum()
-        
-        print("\n" + "="*80)
-        print(f"Total Squad Cost: ${total_cost:,} / ${config.SALARY_CAP:,}")
-        print(f"Money Remaining: ${config.SALARY_CAP - total_cost:,}")
-        print(f"Expected Weekly Score: {total_score:.2f}")
-        print(f"Average Value: {self.selected_team['adjusted_value'].mean():.2f}")
-        print("="*80)
-    
-    def save_team(self, filepath='optimal_team.csv'):
-        """Save team to CSV"""
-        if self.selected_team is None:
-            raise ValueError("No team selected.")
-        
-        self.selected_team.to_csv(filepath, index=False)
-        print(f"\nTeam saved to {filepath}")
-    
-    def analyze_team_balance(self):
-        """Analyze team composition and balance"""
-        if self.selected_team is None:
-            raise ValueError("No team selected.")
-        
-        print("\n--- TEAM ANALYSIS ---")
-        
-        # Age distribution
-        avg_age = self.selected_team['age'].mean()
-        print(f"Average Age: {avg_age:.1f}")
-        
-        # Team diversity
-        team_counts = self.selected_team['team'].value_counts()
-        print(f"\nTeam Diversity: {len(team_counts)} different AFL teams")
-        print("Players per team:")
-        for team, count in team_counts.head(5).items():
-            print(f"  {team}: {count}")
-        
-        # Price distribution
-        print(f"\nPrice Range: ${self.selected_team['price'].min():,} - "
-              f"${self.selected_team['price'].max():,}")
-        print(f"Average Price: ${self.selected_team['price'].mean():,.0f}")
-        
-        # Risk assessment
-        avg_injury = self.selected_team['injury_history'].mean()
-        print(f"\nAverage Injury History: {avg_injury:.2f}")
-        
-        return {
-            'avg_age': avg_age,
-            'team_diversity': len(team_counts),
-            'avg_price': self.selected_team['price'].mean(),
-            'avg_injury_risk': avg_injury
-        }
@@ -2,18 +2,15 @@
 Team optimization module using constraint-based optimization
 """
 import numpy as np
-import pandas as pd
-from scipy.optimize import linprog
 import config
+from output_utils import buffered_output
+from team_optimizer_base import BaseTeamOptimizer, POSITION_REQUIREMENTS, SLOTS, SLOT_INDEX, _first_fit
 
 
-class TeamOptimizer:
+class TeamOptimizer(BaseTeamOptimizer):
     """Optimizes team selection based on predicted performance and constraints"""
     
-    def __init__(self):
-        self.selected_team = None
-        self.optimization_result = None
-        
+    @buffered_output
     def optimize_team(self, players_df, strategy='balanced'):
         """
         Optimize team selection using budget-constrained greedy algorithm
@@ -26,35 +23,14 @@ class TeamOptimizer:
         print("OPTIMIZING TEAM SELECTION")
         print("="*60)
         
-        # Prepare data
-        df = players_df.copy()
-        
-        # Choose objective based on strategy
-        if strategy == 'value':
-            df['objective'] = df['adjusted_value']
-        elif strategy == 'high_score':
-            df['objective'] = df['predicted_score']
-        else:  # balanced
-            df['objective'] = df['predicted_score'] * 0.7 + df['adjusted_value'] * 0.3
-        
-        # Calculate fixed budget allocation per position to ensure all can be filled
-        # Based on minimum prices we need to reserve
-        min_prices = {}
-        for pos in ['DEF', 'MID', 'RUC', 'FWD']:
-            required = config.POSITION_REQUIREMENTS[pos]['min']
-            pos_players = df[df['position'] == pos].nsmallest(required, 'price')
-            min_prices[pos] = pos_players['price'].sum()
-        
-        # Reserve for bench (cheapest 8 players overall)
-        bench_needed = config.POSITION_REQUIREMENTS['BENCH']['min']
-        min_prices['BENCH'] = df.nsmallest(bench_needed, 'price')['price'].sum()
+        df, objective, by_objective, by_price, min_prices = self._rank_players(players_df, strategy)
         
         total_min = sum(min_prices.values())
         buffer = config.SALARY_CAP - total_min  # Extra budget we can use for better players
         
         # Allocate budget proportionally but ensure minimums
         position_budgets = {}
-        for pos in ['DEF', 'MID', 'RUC', 'FWD', 'BENCH']:
+        for pos in SLOTS:
             # Each position gets its minimum plus a share of the buffer
             if pos == 'MID':
                 position_budgets[pos] = min_prices[pos] + buffer * 0.35  # 35% of buffer to midfielders
@@ -71,35 +47,33 @@ class TeamOptimizer:
         for pos in ['MID', 'DEF', 'FWD', 'RUC', 'BENCH']:
             print(f"  {pos}: ${position_budgets[pos]:,.0f}")
         
-        selected_players = []
+        # Selected players as df row labels, and their player_ids
+        selected_rows = []
+        selected_ids = set()
         remaining_budget = config.SALARY_CAP
-        position_counts = {pos: 0 for pos in config.POSITION_REQUIREMENTS.keys()}
-        total_players_needed = config.TEAM_SIZE
+        position_counts = np.zeros(len(SLOTS), dtype=np.int64)
+        
+        # Minimum price to reserve while filling each position: the cheapest
+        # players for every position filled after it (fixed for the run)
+        fill_order = ['MID', 'DEF', 'FWD', 'RUC']  # Order by importance
+        future_reserve = {pos: sum(min_prices[future_pos] for future_pos in fill_order[i + 1:])
+                          for i, pos in enumerate(fill_order)}
+        
+        # Bench reserve candidates: the cheapest players overall, with room
+        # for every squad pick made before the reserve is taken
+        bench_needed = POSITION_REQUIREMENTS['BENCH']['min']
+        bench_candidates = df.nsmallest(bench_needed + config.TEAM_SIZE, 'price')
         
         # Phase 1: Fill required positions with quality players (balanced budget approach)
-        for position in ['MID', 'DEF', 'FWD', 'RUC']:  # Order by importance
-            pos_df = df[df['position'] == position].sort_values('objective', ascending=False).copy()
-            required = config.POSITION_REQUIREMENTS[position]['min']
-            
-            # How much budget do we have left per remaining player?
-            remaining_players_needed = total_players_needed - len(selected_players)
-            budget_per_remaining_player = remaining_budget / remaining_players_needed if remaining_players_needed > 0 else 0
-            
-            # Calculate minimum price we need to reserve for future positions
-            # Estimate cheapest players for each remaining position
-            future_positions = ['MID', 'DEF', 'FWD', 'RUC'][['MID', 'DEF', 'FWD', 'RUC'].index(position)+1:]
-            min_budget_to_reserve = 0
-            for future_pos in future_positions:
-                future_required = config.POSITION_REQUIREMENTS[future_pos]['min']
-                # Get cheapest players for that position
-                future_df = df[df['position'] == future_pos].nsmallest(future_required, 'price')
-                min_budget_to_reserve += future_df['price'].sum()
+        for position in fill_order:
+            pos_df = by_objective[position]
+            required = POSITION_REQUIREMENTS[position]['min']
+            min_budget_to_reserve = future_reserve[position]
             
             # Also reserve for bench (cheapest 8 players)
             if position == 'RUC':  # Last position, so add bench reserve
-                bench_needed = config.POSITION_REQUIREMENTS['BENCH']['min']
-                selected_ids = [p['player_id'] for p in selected_players]
-                remaining_for_bench = df[~df['player_id'].isin(selected_ids)].nsmallest(bench_needed, 'price')
+                unselected = ~bench_candidates['player_id'].isin(selected_ids)
+                remaining_for_bench = bench_candidates[unselected].head(bench_needed)
                 min_budget_to_reserve += remaining_for_bench['price'].sum()
             
             # Available budget for this position
@@ -107,91 +81,91 @@ class TeamOptimizer:
             max_price_per_player = available_for_position / required if required > 0 else 0
             max_price_per_player = max(max_price_per_player, 150000)  # At least 150k
             
-            count = 0
-            for _, player in pos_df.iterrows():
-                if count < required:
-                    # Can we afford this player?
-                    if player['price'] <= remaining_budget and player['price'] <= max_price_per_player:
-                        selected_players.append(player.to_dict())
-                        remaining_budget -= player['price']
-                        position_counts[position] += 1
-                        count += 1
-                if count >= required:
-                    break
+            # Take the best players we can afford, among those under the
+            # per-player cap; the picked rows are recorded once, after the scan
+            prices = pos_df['price'].to_numpy(dtype=np.int64)
+            eligible = np.flatnonzero(prices <= max_price_per_player)
+            picked, spent = _first_fit(prices[eligible], remaining_budget, required)
+            picked = eligible[picked]
+            remaining_budget -= spent
+            selected_rows.extend(pos_df.index[picked])
+            selected_ids.update(pos_df['player_id'].iloc[picked])
+            position_counts[SLOT_INDEX[position]] += len(picked)
+            count = len(picked)
             
             # Fallback: if we couldn't fill the position, get cheaper players
             if count < required:
-                cheaper_players = pos_df[pos_df['price'] <= remaining_budget].sort_values('price')
-                for _, player in cheaper_players.iterrows():
-                    player_id = player['player_id']
-                    if player_id not in [p['player_id'] for p in selected_players]:
-                        if count < required and player['price'] <= remaining_budget:
-                            selected_players.append(player.to_dict())
-                            remaining_budget -= player['price']
-                            position_counts[position] += 1
+                cheaper_players = by_price[position]
+                cheaper_players = cheaper_players[cheaper_players['price'] <= remaining_budget]
+                player_ids = cheaper_players['player_id'].to_numpy()
+                prices = cheaper_players['price'].to_numpy(dtype=np.int64)
+                picked = []
+                for i in range(len(prices)):
+                    if player_ids[i] not in selected_ids:
+                        if count < required and prices[i] <= remaining_budget:
+                            picked.append(i)
+                            selected_ids.add(player_ids[i])
+                            remaining_budget -= prices[i]
                             count += 1
                         if count >= required:
                             break
+                selected_rows.extend(cheaper_players.index[picked])
+                position_counts[SLOT_INDEX[position]] += len(picked)
         
         # Phase 2: Fill any missing position requirements with cheapest available
         # Check if all required positions are filled
-        for position in ['DEF', 'MID', 'RUC', 'FWD']:
-            required = config.POSITION_REQUIREMENTS[position]['min']
-            current_count = position_counts[position]
+        for position in config.POS_ORDER:
+            required = POSITION_REQUIREMENTS[position]['min']
+            current_count = position_counts[SLOT_INDEX[position]]
             
             if current_count < required:
                 print(f"\nFilling remaining {position} positions ({current_count}/{required})...")
-                pos_df = df[df['position'] == position].copy()
-                selected_ids = [p['player_id'] for p in selected_players]
-                available = pos_df[~pos_df['player_id'].isin(selected_ids)].sort_values('price')
+                pos_df = by_price[position]
+                available = pos_df[~pos_df['player_id'].isin(selected_ids)]
+                names = available['name'].to_numpy()
+                prices = available['price'].to_numpy(dtype=np.int64)
                 
-                for _, player in available.iterrows():
-                    if current_count < required and player['price'] <= remaining_budget:
-                        selected_players.append(player.to_dict())
-                        remaining_budget -= player['price']
-                        position_counts[position] += 1
-                        current_count += 1
-                        print(f"  ✓ Added {player['name']} for ${player['price']:,}")
-                    if current_count >= required:
-                        break
+                picked, spent = _first_fit(prices, remaining_budget, required - current_count)
+                remaining_budget -= spent
+                for i in picked:
+                    print(f"  ✓ Added {names[i]} for ${prices[i]:,}")
+                selected_rows.extend(available.index[picked])
+                selected_ids.update(available['player_id'].iloc[picked])
+                position_counts[SLOT_INDEX[position]] += len(picked)
         
         # Phase 3: Fill bench with best available value players
-        bench_needed = config.POSITION_REQUIREMENTS['BENCH']['min']
+        bench_needed = POSITION_REQUIREMENTS['BENCH']['min']
         
         print(f"\nFilling bench ({bench_needed} players needed, ${remaining_budget:,} remaining)...")
         
         # Get remaining players not already selected
-        selected_ids = [p['player_id'] for p in selected_players]
         remaining_df = df[~df['player_id'].isin(selected_ids)].copy()
         
         # Sort by value (want good bench players for low price)
         remaining_df = remaining_df.sort_values('adjusted_value', ascending=False)
         
-        bench_count = 0
-        for _, player in remaining_df.iterrows():
-            if bench_count < bench_needed:
-                if player['price'] <= remaining_budget:
-                    selected_players.append(player.to_dict())
-                    remaining_budget -= player['price']
-                    position_counts['BENCH'] += 1
-                    bench_count += 1
+        prices = remaining_df['price'].to_numpy(dtype=np.int64)
+        picked, spent = _first_fit(prices, remaining_budget, bench_needed)
+        remaining_budget -= spent
+        selected_rows.extend(remaining_df.index[picked])
+        selected_ids.update(remaining_df['player_id'].iloc[picked])
+        position_counts[SLOT_INDEX['BENCH']] += len(picked)
+        bench_count = len(picked)
         
         # Final fallback: if still missing bench players, get absolute cheapest
         if bench_count < bench_needed:
-            remaining_ids = [p['player_id'] for p in selected_players]
-            remaining_df = df[~df['player_id'].isin(remaining_ids)].sort_values('price')
+            remaining_df = df[~df['player_id'].isin(selected_ids)].sort_values('price')
+            prices = remaining_df['price'].to_numpy(dtype=np.int64)
             
-            for _, player in remaining_df.iterrows():
-                if bench_count < bench_needed and player['price'] <= remaining_budget:
-                    selected_players.append(player.to_dict())
-                    remaining_budget -= player['price']
-                    position_counts['BENCH'] += 1
-                    bench_count += 1
-                if bench_count >= bench_needed:
-                    break
+            picked, spent = _first_fit(prices, remaining_budget, bench_needed - bench_count)
+            remaining_budget -= spent
+            bench_count += len(picked)
+            selected_rows.extend(remaining_df.index[picked])
+            selected_ids.update(remaining_df['player_id'].iloc[picked])
+            position_counts[SLOT_INDEX['BENCH']] += len(picked)
         
         # Create team DataFrame
-        self.selected_team = pd.DataFrame(selected_players)
+        self._build_team(df, selected_rows, objective)
         
         # Calculate team statistics
         total_cost = self.selected_team['price'].sum()
@@ -206,118 +180,9 @@ class TeamOptimizer:
         print(f"Total Predicted Score: {total_predicted_score:.2f}")
         print(f"Average Value Score: {avg_value:.2f}")
         print(f"\nPosition Breakdown:")
-        for pos in ['DEF', 'MID', 'RUC', 'FWD', 'BENCH']:
-            count = position_counts[pos]
-            req = config.POSITION_REQUIREMENTS[pos]
+        for pos, count in zip(SLOTS, position_counts):
+            req = POSITION_REQUIREMENTS[pos]
             status = "✓" if count >= req['min'] and count <= req['max'] else "✗"
             print(f"  {status} {pos}: {count} (required: {req['min']}-{req['max']})")
         
         return self.selected_team
-    
-    def get_starting_lineup(self):
-        """Get the starting 22 players (on-field)"""
-        if self.selected_team is None:
-            raise ValueError("No team selected. Call optimize_team() first.")
-        
-        starting_lineup = []
-        
-        for position in ['DEF', 'MID', 'RUC', 'FWD']:
-            pos_players = self.selected_team[self.selected_team['position'] == position]
-            on_field = config.POSITION_REQUIREMENTS[position]['on_field']
-            
-            # Select top players by predicted score
-            top_players = pos_players.nlargest(on_field, 'predicted_score')
-            starting_lineup.append(top_players)
-        
-        starting_df = pd.concat(starting_lineup)
-        return starting_df
-    
-    def get_bench_players(self):
-        """Get bench players"""
-        if self.selected_team is None:
-            raise ValueError("No team selected. Call optimize_team() first.")
-        
-        starting = self.get_starting_lineup()
-        bench = self.selected_team[~self.selected_team['player_id'].isin(starting['player_id'])]
-        return bench
-    
-    def display_team(self):
-        """Display formatted team selection"""
-        if self.selected_team is None:
-            raise ValueError("No team selected. Call optimize_team() first.")
-        
-        print("\n" + "="*80)
-        print("2026 AFL SUPERCOACH OPTIMAL TEAM")
-        print("="*80)
-        
-        # Starting lineup
-        print("\n--- STARTING LINEUP ---")
-        starting = self.get_starting_lineup()
-        
-        for position in ['DEF', 'MID', 'RUC', 'FWD']:
-            print(f"\n{position}:")
-            pos_players = starting[starting['position'] == position]
-            for _, player in pos_players.iterrows():
-                print(f"  {player['name']:25s} ({player['team']:15s}) - "
-                      f"${player['price']:7,} - Score: {player['predicted_score']:6.2f} - "
-                      f"Value: {player['adjusted_value']:5.2f}")
-        
-        # Bench
-        print("\n--- BENCH ---")
-        bench = self.get_bench_players()
-        for _, player in bench.iterrows():
-            print(f"  {player['name']:25s} ({player['team']:15s}) - "
-                  f"${player['price']:7,} - Score: {player['predicted_score']:6.2f}")
-        
-        # Summary
-        total_cost = self.selected_team['price'].sum()
-        total_score = starting['predicted_score'].sum()
-        
-        print("\n" + "="*80)
-        print(f"Total Squad Cost: ${total_cost:,} / ${config.SALARY_CAP:,}")
-        print(f"Money Remaining: ${config.SALARY_CAP - total_cost:,}")
-        print(f"Expected Weekly Score: {total_score:.2f}")
-        print(f"Average Value: {self.selected_team['adjusted_value'].mean():.2f}")
-        print("="*80)
-    
-    def save_team(self, filepath='optimal_team.csv'):
-        """Save team to CSV"""
-        if self.selected_team is None:
-            raise ValueError("No team selected.")
-        
-        self.selected_team.to_csv(filepath, index=False)
-        print(f"\nTeam saved to {filepath}")
-    
-    def analyze_team_balance(self):
-        """Analyze team composition and balance"""
-        if self.selected_team is None:
-            raise ValueError("No team selected.")
-        
-        print("\n--- TEAM ANALYSIS ---")
-        
-        # Age distribution
-        avg_age = self.selected_team['age'].mean()
-        print(f"Average Age: {avg_age:.1f}")
-        
-        # Team diversity
-        team_counts = self.selected_team['team'].value_counts()
-        print(f"\nTeam Diversity: {len(team_counts)} different AFL teams")
-        print("Players per team:")
-        for team, count in team_counts.head(5).items():
-            print(f"  {team}: {count}")
-        
-        # Price distribution
-        print(f"\nPrice Range: ${self.selected_team['price'].min():,} - "
-              f"${self.selected_team['price'].max():,}")
-        print(f"Average Price: ${self.selected_team['price'].mean():,.0f}")
-        
-        # Risk assessment
-        avg_injury = self.selected_team['injury_history'].mean()
-        print(f"\nAverage Injury History: {avg_injury:.2f}")
-        
-        return {
-            'avg_age': avg_age,
-            'team_diversity': len(team_counts),
-            'avg_price': self.selected_team['price'].mean(),
-            'avg_injury_risk': avg_injury
-        }
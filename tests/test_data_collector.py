@@ -0,0 +1,107 @@
+"""
+Tests for sample data generation and caching
+"""
+import os
+
+import pandas as pd
+import pytest
+import requests
+
+import config
+from data_collector import AFLDataCollector
+
+# A FootyWire-style price page: the player table is the first table whose
+# class list contains "data", after an unrelated "datagrid" table
+PRICE_PAGE = """
+<html><body>
+<table class="datagrid"><tr><td>Not players</td></tr></table>
+<table class="data sortable">
+<tr><th>Name</th><th>Team</th><th>Pos</th><th>Price</th><th>Avg</th><th>Games</th><th>Rank</th></tr>
+<tr><td><a href="/afl/footy/pp-a">Ann Able</a></td><td>Carlton</td><td>MID</td>
+<td>$612,300</td><td>110.5</td><td>22</td><td>1</td></tr>
+<tr><td><a href="/afl/footy/pp-b">Bo Baker</a></td><td>Geelong</td><td>Back</td>
+<td>$345,000</td><td>75.2</td><td>18</td><td>2</td></tr>
+<tr><td>Cy Nolink</td><td>Sydney</td><td>Ruck</td><td>$0</td><td>0</td><td>0</td><td>3</td></tr>
+</table>
+</body></html>
+"""
+
+# A player page with details in a "playerno" table
+PLAYER_PAGE = """
+<html><body>
+<table class="playerno info">
+<tr><td>Age</td><td>24 years</td></tr>
+<tr><td>Drafted</td><td>2019 #7</td></tr>
+</table>
+</body></html>
+"""
+
+
+def test_seeded_sample_data_is_reproducible(tmp_path):
+    cache_path = str(tmp_path / 'sample_players.parquet')
+    first = AFLDataCollector(cache_path=cache_path).load_sample_data(seed=7)
+    second = AFLDataCollector(cache_path=cache_path).load_sample_data(seed=7)
+    
+    pd.testing.assert_frame_equal(first, second)
+    assert first is not second
+    assert len(list(tmp_path.iterdir())) == 1
+    assert not first['price'].equals(AFLDataCollector(cache_path=None).load_sample_data(seed=8)['price'])
+
+
+def test_unseeded_sample_data_is_fresh_and_not_cached(tmp_path):
+    collector = AFLDataCollector(cache_path=str(tmp_path / 'sample_players.parquet'))
+    first = collector.load_sample_data(seed=None)
+    second = collector.load_sample_data(seed=None)
+    
+    assert not first['price'].equals(second['price'])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_caches_default_to_config_cache_dir():
+    collector = AFLDataCollector()
+    
+    assert os.path.isabs(config.CACHE_DIR)
+    assert os.path.dirname(collector.cache_path) == config.CACHE_DIR
+    assert os.path.dirname(collector.http_cache_dir) == config.CACHE_DIR
+
+
+def test_sample_cache_creates_its_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache_dir = tmp_path / 'cache'
+    AFLDataCollector(cache_path=str(cache_dir / 'sample_players.parquet')).load_sample_data(seed=11)
+    
+    assert [path.parent for path in tmp_path.rglob('*.parquet')] == [cache_dir]
+
+
+def test_player_details_empty_on_request_error(monkeypatch):
+    collector = AFLDataCollector(http_cache_dir=None)
+    
+    def fail(url, timeout=15):
+        raise requests.ConnectionError(url)
+    monkeypatch.setattr(collector, 'fetch_page', fail)
+    assert collector.get_player_details('https://example.com/player') == {}
+    
+    def broken(url, timeout=15):
+        raise TypeError(url)
+    monkeypatch.setattr(collector, 'fetch_page', broken)
+    with pytest.raises(TypeError):
+        collector.get_player_details('https://example.com/player')
+
+
+def test_load_real_data_parses_price_table(monkeypatch):
+    collector = AFLDataCollector(cache_path=None, http_cache_dir=None)
+    monkeypatch.setattr(collector, 'fetch_page', lambda url, timeout=15: PRICE_PAGE)
+    players = collector.load_real_data(seed=0)
+    
+    assert list(players['name']) == ['Ann Able', 'Bo Baker']
+    assert list(players['team']) == ['Carlton', 'Geelong']
+    assert list(players['position']) == ['MID', 'DEF']
+    assert list(players['price']) == [612300, 345000]
+    assert list(players['avg_score']) == pytest.approx([110.5, 75.2])
+    assert list(players['games_played']) == [22, 18]
+
+
+def test_parse_player_details_reads_playerno_table():
+    details = AFLDataCollector(http_cache_dir=None)._parse_player_details(PLAYER_PAGE)
+    
+    assert details == {'age': 24, 'draft_pick': 7}
@@ -0,0 +1,48 @@
+"""
+Tests for feature encoding across training runs
+"""
+import numpy as np
+import pytest
+
+from data_collector import AFLDataCollector
+from ml_predictor import FEATURE_COLUMNS, PlayerPerformancePredictor
+
+TEAM_COLUMN = FEATURE_COLUMNS.index('team_encoded')
+
+
+@pytest.fixture(scope='module')
+def players():
+    """Seeded sample players (team/position as categoricals)"""
+    return AFLDataCollector(cache_path=None).load_sample_data(seed=0)
+
+
+@pytest.mark.parametrize('team_dtype', ['object', 'category'])
+def test_retrain_refits_encoders_on_new_teams(players, team_dtype):
+    players = players.assign(team=players['team'].astype(str).astype(team_dtype))
+    renamed = players.assign(team=('New ' + players['team'].astype(str)).astype(team_dtype))
+    
+    predictor = PlayerPerformancePredictor()
+    predictor.train_score_predictor(players)
+    predictor.train_score_predictor(renamed)
+    fresh = PlayerPerformancePredictor()
+    fresh.train_score_predictor(renamed)
+    
+    assert list(predictor.team_encoder.classes_) == sorted(set(renamed['team']))
+    X, _ = predictor._features(renamed)
+    assert (X[:, TEAM_COLUMN] >= 0).all()
+    np.testing.assert_array_equal(predictor.predict_scores(renamed), fresh.predict_scores(renamed))
+
+
+def test_feature_cache_reused_until_retrained(players):
+    renamed = players.assign(team=('New ' + players['team'].astype(str)).astype('category'))
+    
+    predictor = PlayerPerformancePredictor()
+    predictor.train_score_predictor(players)
+    X, _ = predictor._features(players)
+    assert predictor._features(players)[0] is X
+    assert predictor._features(players.copy())[0] is not X
+    
+    predictor.train_score_predictor(renamed)
+    fresh = PlayerPerformancePredictor()
+    fresh.train_score_predictor(renamed)
+    np.testing.assert_array_equal(predictor.predict_scores(players), fresh.predict_scores(players))
@@ -0,0 +1,230 @@
+"""
+Tests for the team selection routines on a small feasible player list
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import config
+import team_optimizer
+from team_optimizer import ILP_BENCH_WEIGHT, InfeasibleSquadError, TeamOptimizer, _greedy_bench, optimize_portfolio
+from team_optimizer_base import _first_fit
+
+STRATEGIES = ['max_score', 'balanced', 'value']
+
+
+def make_players(seed, players_per_position=(12, 16, 6, 12)):
+    """Scored players (as after calculate_value_scores) whose cheapest legal squad fits the cap"""
+    rng = np.random.default_rng(seed)
+    positions = np.repeat(config.POS_ORDER, players_per_position)
+    n = len(positions)
+    price = rng.integers(100, 550, n) * 1000
+    predicted_score = np.round(40 + price / 10000 + rng.normal(0, 12, n), 2)
+    adjusted_value = predicted_score / price * 100000
+    return pd.DataFrame({
+        'player_id': np.arange(n),
+        'name': [f'Player {i}' for i in range(n)],
+        'team': rng.choice(['Adelaide', 'Carlton', 'Geelong', 'Sydney'], n),
+        'position': positions,
+        'price': price,
+        'age': rng.integers(18, 34, n),
+        'injury_history': rng.integers(0, 3, n),
+        'predicted_score': predicted_score,
+        'adjusted_value': adjusted_value,
+        'overall_rank_score': predicted_score * rng.uniform(0.9, 1.2, n),
+    })
+
+
+def reference_bench(candidates, prices, pos_codes, budget, position_counts, max_per_pos, needed):
+    """The scalar bench loop _greedy_bench replaces"""
+    picked = []
+    for i in candidates:
+        if len(picked) >= needed:
+            break
+        code = pos_codes[i]
+        if code >= 0 and prices[i] <= budget and position_counts[code] < max_per_pos[code]:
+            picked.append(i)
+            budget -= prices[i]
+            position_counts[code] += 1
+    return picked, budget
+
+
+def reference_greedy(players_df, strategy):
+    """Baseline greedy selection (per-player loops, no local search) as sorted player_ids"""
+    if strategy == 'max_score':
+        objective = players_df['overall_rank_score']
+    elif strategy == 'value':
+        objective = players_df['adjusted_value']
+    else:
+        objective = players_df['predicted_score'] * players_df['adjusted_value']
+    order = objective.reset_index(drop=True).sort_values(ascending=False).index.to_numpy()
+    pos_codes = pd.Categorical(players_df['position'], categories=config.POS_ORDER).codes[order]
+    prices = players_df['price'].to_numpy(dtype=np.int64)[order]
+    scores = players_df['predicted_score'].to_numpy()[order]
+    min_per_pos, max_per_pos, onfield_per_pos = config.POS_REQ_ARRAY.T.tolist()
+    total_onfield = sum(onfield_per_pos)
+    
+    selected = []
+    budget = config.SALARY_CAP
+    counts = np.zeros(len(config.POS_ORDER), dtype=np.int32)
+    for code, pos in enumerate(config.POS_ORDER):
+        needed = onfield_per_pos[code]
+        pos_rows = np.flatnonzero(pos_codes == code)
+        share = 0.85 if strategy == 'max_score' else 0.7
+        target_price = (needed / total_onfield) * config.SALARY_CAP * share / needed
+        if strategy == 'max_score':
+            threshold = pd.Series(scores[pos_rows]).quantile(0.6)
+        taken = 0
+        for i in pos_rows:
+            if taken < needed and prices[i] <= budget:
+                if strategy == 'max_score':
+                    accept = scores[i] >= threshold or taken >= needed - 2
+                else:
+                    accept = prices[i] <= target_price * 1.5 or taken >= needed - 1
+                if accept or taken >= needed - 1:
+                    selected.append(i)
+                    budget -= prices[i]
+                    counts[code] += 1
+                    taken += 1
+            if taken >= needed:
+                break
+    
+    available = np.ones(len(order), dtype=bool)
+    available[selected] = False
+    price_order = np.argsort(prices, kind='stable')
+    bench, _ = reference_bench(price_order[available[price_order]], prices, pos_codes, budget,
+                               counts, max_per_pos, config.BENCH_SIZE)
+    selected.extend(bench)
+    return players_df['player_id'].to_numpy()[order[selected]].tolist()
+
+
+def check_legal_squad(team):
+    """Assert team is a legal squad under the salary cap"""
+    assert len(team) == config.TEAM_SIZE
+    assert team['player_id'].is_unique
+    assert team['price'].sum() <= config.SALARY_CAP
+    assert team['onfield'].sum() == config.STARTING_LINEUP_SIZE
+    for pos, (lo, hi, on_field) in zip(config.POS_ORDER, config.POS_REQ_ARRAY.tolist()):
+        in_pos = team['position'] == pos
+        assert lo <= in_pos.sum() <= hi
+        assert (in_pos & team['onfield']).sum() == on_field
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+@pytest.mark.parametrize('seed', range(3))
+def test_ilp_returns_legal_squad(seed, strategy):
+    team = TeamOptimizer().optimize_team_ilp(make_players(seed), strategy=strategy)
+    check_legal_squad(team)
+
+
+def test_ilp_rejects_infeasible_cap():
+    players = make_players(0)
+    players['price'] *= 3
+    with pytest.raises(ValueError):
+        TeamOptimizer().optimize_team_ilp(players)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_two_opt_never_lowers_objective(seed):
+    players = make_players(seed)
+    rng = np.random.default_rng(seed)
+    objective = players['predicted_score'].to_numpy(dtype=np.float64)
+    prices = players['price'].to_numpy(dtype=np.int64)
+    pos_codes = pd.Categorical(players['position'], categories=config.POS_ORDER).codes
+    
+    # A random legal selection: the starting players plus two bench players
+    # per position, drawn from the cheapest few until the squad fits the cap
+    def draw():
+        rows, onfield = [], []
+        for code, on_field in enumerate(config.POS_REQ_ARRAY[:, 2].tolist()):
+            pos_rows = np.flatnonzero(pos_codes == code)
+            cheap = pos_rows[np.argsort(prices[pos_rows])][:on_field + 4]
+            rows.extend(rng.choice(cheap, on_field + 2, replace=False))
+            onfield.extend([True] * on_field + [False] * 2)
+        return rows, onfield
+    
+    rows, onfield = draw()
+    while prices[rows].sum() > config.SALARY_CAP:
+        rows, onfield = draw()
+    weights = np.where(onfield, 1.0, ILP_BENCH_WEIGHT)
+    before = (objective[rows] * weights).sum()
+    
+    improved, swaps, gain = TeamOptimizer()._two_opt_improve(objective, prices, pos_codes, rows, onfield)
+    after = (objective[improved] * weights).sum()
+    
+    assert after >= before - 1e-9
+    assert after == pytest.approx(before + gain)
+    assert (swaps == 0) == (gain == 0)
+    assert prices[improved].sum() <= config.SALARY_CAP
+    assert len(set(improved)) == len(rows)
+    assert (pos_codes[improved] == pos_codes[rows]).all()
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_greedy_bench_matches_loop(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(0, 40))
+    prices = rng.integers(100, 600, n).astype(np.int64) * 1000
+    pos_codes = rng.integers(-1, 4, n).astype(np.int8)
+    candidates = rng.permutation(n)
+    budget = int(rng.integers(0, 4000)) * 1000
+    max_per_pos = [2, 3, 1, 2]
+    counts = rng.integers(0, 2, 4).astype(np.int32)
+    needed = int(rng.integers(0, 10))
+    
+    expected_counts = counts.copy()
+    expected = reference_bench(candidates, prices, pos_codes, budget, expected_counts, max_per_pos, needed)
+    picked, remaining = _greedy_bench(candidates, prices, pos_codes, budget, counts, max_per_pos, needed)
+    
+    assert list(picked) == list(expected[0])
+    assert remaining == expected[1]
+    assert (counts == expected_counts).all()
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('cap', [8000000, 9000000, config.SALARY_CAP])
+def test_greedy_matches_baseline_loop(seed, strategy, cap, monkeypatch):
+    monkeypatch.setattr(config, 'SALARY_CAP', cap)
+    # Compare the greedy picks themselves, before any 2-opt swaps
+    monkeypatch.setattr(TeamOptimizer, '_two_opt_improve',
+                        lambda self, objective, prices, pos_codes, rows, onfield: (rows, 0, 0.0))
+    players = make_players(seed)
+    team = team_optimizer.TeamOptimizer().optimize_team(players, strategy=strategy)
+    assert team['player_id'].tolist() == reference_greedy(players, strategy)
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_first_fit_matches_loop(seed):
+    rng = np.random.default_rng(seed)
+    prices = rng.integers(100, 900, int(rng.integers(0, 25))).astype(np.int64) * 1000
+    budget = int(rng.integers(0, 6000)) * 1000 + rng.random()
+    needed = int(rng.integers(0, 9))
+    
+    expected, spent = [], 0
+    for i, price in enumerate(prices):
+        if len(expected) < needed and spent + price <= budget:
+            expected.append(i)
+            spent += price
+        if len(expected) >= needed:
+            break
+    
+    picked, total = _first_fit(prices, budget, needed)
+    assert picked == expected
+    assert total == spent
+
+
+def test_portfolio_skips_infeasible_draws(monkeypatch):
+    monkeypatch.setattr(config, 'SALARY_CAP', 1000000)
+    players = make_players(0)
+    with pytest.raises(InfeasibleSquadError):
+        TeamOptimizer().optimize_team(players)
+    assert optimize_portfolio(players, strategies=('value',), n_sims=3, n_jobs=1) == {}
+
+
+def test_portfolio_propagates_other_errors(monkeypatch):
+    def broken(self, players_df, strategy):
+        raise ValueError('not an infeasible squad')
+    monkeypatch.setattr(TeamOptimizer, '_optimize_team', broken)
+    with pytest.raises(ValueError, match='not an infeasible squad'):
+        optimize_portfolio(make_players(0), strategies=('value',), n_sims=1, n_jobs=1)